@@ -24,7 +24,6 @@
 import os
 import copy
 import json
-import time
 
 # =========================================
 # extension python libraries
@@ -38,8 +37,12 @@ import Conf
 from App.Model import Gallery
 from Lib.Recovery.Content import Page
 from Lib.Utils import Err
+from Lib.Utils.Writer import Writer
+from Lib.Utils.Journal import Journal
 assert Conf
 assert Gallery
+assert Writer
+assert Journal
 
 # global config variables
 CFG_FOLDER = "Config"
@@ -52,12 +55,11 @@ DATA_SCHEMA = Conf.configGlobal(CFG_FOLDER, CFG_SCHEMA)
 DEFAULT_FRAME_SCHEMA = eval(DATA_SCHEMA.get("DEFAULT", "columns"))
 
 
-# defaul waiting time for scrapping data, this helps not to get blocked
-DEFAULT_SLEEP_TIME = 3.0
+# number of letters scraped and written to the CSV file at once in do_all()
+DEFAULT_BATCH_SIZE = 10
 
-# default short waiting time for scrapping data, avoids some errors if the
-# script goes to fast
-DEFAULT_SHORT_SLEEP_TIME = 0.2
+# journal fields scraped from the letter print page
+DEFAULT_LETTER_FIELDS = ["metadata", "original", "translation", "notes"]
 
 
 class Controller ():
@@ -79,6 +81,8 @@ class Controller ():
     imgd_path = str()
     schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
     gallery = Gallery()
+    pool = None
+    journal = None
     wpage = Page()
 
     # =========================================
@@ -95,6 +99,10 @@ class Controller ():
             schema (list): array with the column names for the model
             gallery (Gallery): object with the gallery dataframe model
             # wpage (Page): the current webpage the controller is scrapping
+            pool (Pool, optional): HTTP connection pool shared with the
+            gallery model pages
+            journal (Journal, optional): journal of the scrapping tasks of
+            every letter, Default is a Journal() kept in memory
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -110,6 +118,8 @@ class Controller ():
             self.imgd_path = str()
             self.schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
             self.gallery = Gallery()
+            self.pool = None
+            self.journal = Journal()
             self.wpage = Page()
 
             # when arguments are pass as parameters
@@ -142,6 +152,15 @@ class Controller ():
                     if key == "model":
                         self.gallery = kwargs[key]
 
+                    # sharing the HTTP connection pool
+                    if key == "pool":
+                        self.pool = kwargs[key]
+                        self.wpage = Page(pool=self.pool)
+
+                    # resumable journal of the scrapping tasks
+                    if key == "journal":
+                        self.journal = kwargs[key]
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Controller: __init__")
@@ -240,12 +259,19 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: build_links")
 
-    def do_all(self, gurl):
+    def do_all(self, gurl, name="letters", batch=DEFAULT_BATCH_SIZE):
         """
-        Scrap the whole letters repository and saves it in a csv file
+        Scrap the whole letters repository and saves it in a csv file, the
+        letters are scraped in batches and appended to the file as soon as
+        they are ready, a restarted run skips the letters already written
+        and the letters that fail are recorded in the journal and skipped
 
         Args:
             gurl (str): URL for the repository to scrap data
+            name (str, optional): Name of the csv file where the letters are
+            written. Default is letters
+            batch (int, optional): letters scraped and written at once.
+            Default is 10
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -254,12 +280,42 @@ class Controller ():
             gm = self.gallery
             gm.load_body(gurl)
             routes = gm.scrap_routes()
-            for route in routes:
-                data = gm.scrap_all_data(route)
-                data['ID'] = route
-                gm.save(data)
 
-            gm.write_pc()
+            writer = Writer(name+".csv", gm.schema, batch_size=batch)
+            routes = [route for route in routes if not writer.written(route)]
+
+            try:
+                for i in range(0, len(routes), batch):
+                    todo = routes[i:i+batch]
+                    letters = gm.crawl_letters(todo, errors=True)
+                    artworks = gm.crawl_artworks(todo, errors=True)
+
+                    # the failed letters are retried in the next run
+                    ready = list()
+                    for route, data, works in zip(todo, letters, artworks):
+                        if isinstance(data, Exception):
+                            for field in DEFAULT_LETTER_FIELDS:
+                                self.journal.mark(route, field, data)
+                        elif isinstance(works, Exception):
+                            self.journal.mark(route, "artworks", works)
+                        else:
+                            ready.append((route, data, works))
+
+                    # the artworks are already clean when they are joined
+                    gm.clrrecords([data for route, data, works in ready])
+                    for route, data, works in ready:
+                        try:
+                            data.update(gm.artworks_data(route, works))
+                        except Exception as exp:
+                            self.journal.mark(route, "images", exp)
+                            continue
+                        data['ID'] = route
+                        writer.write(data)
+
+            # the letters of the last batch are always written
+            finally:
+                writer.close()
+
         except Exception as exp:
             Err.reraise(exp, "Controller: do_all")
 
@@ -283,9 +339,167 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_routes")
 
+    def diff_routes(self, gurl, id_col):
+        """
+        Scrap the routes of the letters repository and compare them with
+        the routes already in the dataframe (ie.: loaded from the CSV file)
+
+        Args:
+            gurl (str): URL for the repository to scrap data
+            id_col (str): column that contains the ids in the dataframe.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the added and the removed routes
+        """
+        try:
+            gm = self.gallery
+            routes = self.scrap_routes(gurl)
+            ans = gm.diffidx(id_col, routes)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Controller: diff_routes")
+
+    def refresh_routes(self, gurl, id_col, url_col):
+        """
+        Update the dataframe with only the added and removed routes of the
+        letters repository, the later options only scrap the new letters
+        because the rest are already done in the journal
+
+        Args:
+            gurl (str): URL for the repository to scrap data
+            id_col (str): column that contains the ids in the dataframe.
+            url_col (str): column that contains the URLs in the dataframe.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): lists with the added and the removed routes
+        """
+        try:
+            gm = self.gallery
+            added, removed = self.diff_routes(gurl, id_col)
+            links = gm.build_links(added)
+            gm.patchidx([id_col, url_col], added, links, removed)
+            gm.forget(removed)
+            gm.upsert(added, {url_col: links})
+            ans = (added, removed)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Controller: refresh_routes")
+
+    def current(self, cols, routes):
+        """
+        Get the current values of the given columns in the dataframe, the
+        columns that are not in the dataframe are empty
+
+        Args:
+            cols (list): list with the column names
+            routes (list): letter IDs in the dataframe
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): dict with a list of values for each column
+        """
+        try:
+            gm = self.gallery
+            gm.flush()
+            data = dict()
+            for col in cols:
+                if col in gm.data_frame.columns:
+                    data[col] = gm.getdata(col, mutable=True)
+                else:
+                    data[col] = [""] * len(routes)
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Controller: current")
+
+    def missing(self, value):
+        """
+        Check if a value in the dataframe is empty (None, NaN or blank)
+
+        Args:
+            value (any): value of a cell in the dataframe
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the value is empty
+        """
+        try:
+            # NaN is the only value not equal to itself
+            ans = value is None or value != value or str(value).strip() == ""
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Controller: missing")
+
+    def blank(self, data, i):
+        """
+        Check if all the values of a letter are empty in the columns
+
+        Args:
+            data (dict): current values of the columns of the task
+            i (int): position of the letter in the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if all the values of the letter are empty
+        """
+        try:
+            ans = all(self.missing(data[col][i]) for col in data)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Controller: blank")
+
+    def pending(self, routes, fields, data):
+        """
+        List the letters whose tasks are not done, a letter the journal never
+        saw is pending if its values are empty in the dataframe, a letter
+        done in the journal is skipped if its values are present or if the
+        journal recorded them as empty (ie.: a letter without notes), so the
+        values lost in a crash before saving the dataframe are scrapped again
+
+        Args:
+            routes (list): letter IDs in the dataframe
+            fields (list): journal fields of the task, ie.: metadata, notes
+            data (dict): current values of the columns of the task
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): positions of the letters to scrap
+        """
+        try:
+            ans = list()
+            for i, route in enumerate(routes):
+                status = [self.journal.status(route, field)
+                          for field in fields]
+                blank = self.blank(data, i)
+                if all(st is None for st in status):
+                    todo = blank
+                elif not self.journal.done(route, *fields):
+                    todo = True
+                else:
+                    todo = blank and not self.journal.empty(route, *fields)
+                if todo:
+                    ans.append(i)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Controller: pending")
+
     def scrap_metadata(self, gurl, id_col, metadata_cols):
         """
-        Scrap the metadata of the specified letters
+        Scrap the metadata of the specified letters, the letters already
+        done in the journal keep their current values
 
         Args:
             gurl (str): URL for the repository to scrap data
@@ -300,47 +514,99 @@ class Controller ():
             gm = self.gallery
             gm.load_body(gurl)
             routes = gm.getdata(id_col)
-            data = {col: [] for col in metadata_cols}
-            for route in routes:
-                metadata = gm.scrap_metadata(route)
-                for col, value in metadata.items():
-                    data[col].append(value)
+            data = self.current(metadata_cols, routes)
+            scraped = list()
+            for i in self.pending(routes, ["metadata"], data):
+                try:
+                    metadata = gm.scrap_metadata(routes[i])
+                    for col, value in metadata.items():
+                        if col in data:
+                            data[col][i] = value
+                    scraped.append(i)
+                    self.journal.mark(routes[i], "metadata",
+                                      empty=self.blank(data, i))
+                except Exception as exp:
+                    self.journal.mark(routes[i], "metadata", exp)
+            gm.clrcolumns(data, scraped)
+            gm.upsert(routes, data, scraped)
             return data
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_metadata")
 
-    def scrap_original_texts(self, gurl, id_col):
+    def scrap_texts(self, gurl, id_col, text_col, field, scrap):
         """
-        Scrap the original text of the specified letters
+        Scrap a text of the specified letters, the letters already done in
+        the journal keep their current text
 
         Args:
             gurl (str): URL for the repository to scrap data
             id_col (str): column that contains the ids in the dataframe.
+            text_col (str): column that contains the text in the dataframe.
+            field (str): journal field of the text, ie.: original
+            scrap (function): Gallery function to scrap the text of a letter
 
         Raises:
             exp: raise a generic exception if something goes wrong
 
         Returns:
-            originalTexts (list): original text of the letters
+            texts (list): text of the letters
         """
         try:
             gm = self.gallery
             gm.load_body(gurl)
             routes = gm.getdata(id_col)
-            originalTexts = []
-            for route in routes:
-                originalTexts.append(gm.scrap_original_text(route))
+            data = self.current([text_col], routes)
+            texts = data[text_col]
+            scraped = list()
+            for i in self.pending(routes, [field], data):
+                try:
+                    texts[i] = scrap(routes[i])
+                    scraped.append(i)
+                    self.journal.mark(routes[i], field,
+                                      empty=self.missing(texts[i]))
+                except Exception as exp:
+                    self.journal.mark(routes[i], field, exp)
+            gm.clrcolumns(data, scraped)
+            gm.upsert(routes, data, scraped)
+            return texts
+        except Exception as exp:
+            Err.reraise(exp, "Controller: scrap_texts")
+
+    def scrap_original_texts(self, gurl, id_col, original_col="ORIGINAL"):
+        """
+        Scrap the original text of the specified letters
+
+        Args:
+            gurl (str): URL for the repository to scrap data
+            id_col (str): column that contains the ids in the dataframe.
+            original_col (str, optional): column that contains the original
+            text in the dataframe. Default is ORIGINAL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            originalTexts (list): original text of the letters
+        """
+        try:
+            gm = self.gallery
+            originalTexts = self.scrap_texts(gurl, id_col, original_col,
+                                             "original",
+                                             gm.scrap_original_text)
             return originalTexts
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_original_text")
 
-    def scrap_translation_texts(self, gurl, id_col):
+    def scrap_translation_texts(self, gurl, id_col,
+                                translation_col="TRANSLATION"):
         """
         Scrap the translation text of the specified letters
 
         Args:
             gurl (str): URL for the repository to scrap data
             id_col (str): column that contains the ids in the dataframe.
+            translation_col (str, optional): column that contains the
+            translation text in the dataframe. Default is TRANSLATION
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -350,22 +616,22 @@ class Controller ():
         """
         try:
             gm = self.gallery
-            gm.load_body(gurl)
-            routes = gm.getdata(id_col)
-            translationTexts = []
-            for route in routes:
-                translationTexts.append(gm.scrap_translation_text(route))
+            translationTexts = self.scrap_texts(gurl, id_col, translation_col,
+                                                "translation",
+                                                gm.scrap_translation_text)
             return translationTexts
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_translation_text")
 
-    def scrap_notes_texts(self, gurl, id_col):
+    def scrap_notes_texts(self, gurl, id_col, notes_col="NOTES"):
         """
         Scrap the text of the notes of the specified letters
 
         Args:
             gurl (str): URL for the repository to scrap data
             id_col (str): column that contains the ids in the dataframe.
+            notes_col (str, optional): column that contains the notes text in
+            the dataframe. Default is NOTES
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -375,15 +641,96 @@ class Controller ():
         """
         try:
             gm = self.gallery
-            gm.load_body(gurl)
-            routes = gm.getdata(id_col)
-            notesTexts = []
-            for route in routes:
-                notesTexts.append(gm.scrap_notes_text(route))
+            notesTexts = self.scrap_texts(gurl, id_col, notes_col, "notes",
+                                          gm.scrap_notes_text)
             return notesTexts
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_notes_text")
 
+    def scrap_letters(self, gurl, id_col, letter_cols):
+        """
+        Scrap the metadata and the texts (ORIGINAL, TRANSLATION, NOTES) of the
+        specified letters, requesting each letter print page only once, the
+        letters already done in the journal keep their current values
+
+        Args:
+            gurl (str): URL for the repository to scrap data
+            id_col (str): column that contains the ids in the dataframe.
+            letter_cols (list): list with the metadata and text columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): dict with the metadata and texts of the letters
+        """
+        try:
+            gm = self.gallery
+            gm.load_body(gurl)
+            routes = gm.getdata(id_col)
+            data = self.current(letter_cols, routes)
+            scraped = list()
+            for i in self.pending(routes, DEFAULT_LETTER_FIELDS, data):
+                try:
+                    letter = gm.scrap_letter(routes[i])
+                    for col in letter_cols:
+                        data[col][i] = letter.get(col, "")
+                    scraped.append(i)
+                    empty = self.blank(data, i)
+                    for field in DEFAULT_LETTER_FIELDS:
+                        self.journal.mark(routes[i], field, empty=empty)
+                except Exception as exp:
+                    for field in DEFAULT_LETTER_FIELDS:
+                        self.journal.mark(routes[i], field, exp)
+            gm.clrcolumns(data, scraped)
+            gm.upsert(routes, data, scraped)
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Controller: scrap_letters")
+
+    def crawl_letters(self, gurl, id_col, letter_cols):
+        """
+        Scrap the metadata and the texts (ORIGINAL, TRANSLATION, NOTES) of the
+        specified letters, requesting many print pages concurrently, the
+        letters already done in the journal keep their current values
+
+        Args:
+            gurl (str): URL for the repository to scrap data
+            id_col (str): column that contains the ids in the dataframe.
+            letter_cols (list): list with the metadata and text columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): dict with the metadata and texts of the letters
+        """
+        try:
+            gm = self.gallery
+            gm.load_body(gurl)
+            routes = gm.getdata(id_col)
+            data = self.current(letter_cols, routes)
+            todo = self.pending(routes, DEFAULT_LETTER_FIELDS, data)
+            letters = gm.crawl_letters([routes[i] for i in todo],
+                                       errors=True)
+            scraped = list()
+            for i, letter in zip(todo, letters):
+                if isinstance(letter, Exception):
+                    for field in DEFAULT_LETTER_FIELDS:
+                        self.journal.mark(routes[i], field, letter)
+                    continue
+                for col in letter_cols:
+                    data[col][i] = letter.get(col, "")
+                scraped.append(i)
+                empty = self.blank(data, i)
+                for field in DEFAULT_LETTER_FIELDS:
+                    self.journal.mark(routes[i], field, empty=empty)
+            gm.clrcolumns(data, scraped)
+            gm.upsert(routes, data, scraped)
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Controller: crawl_letters")
+
     def scrap_all_data(self, gurl, route):
         """
         Scrap all the data of a specific letter
@@ -433,7 +780,8 @@ class Controller ():
 
     def get_artworks_images(self, gurl, id_col, artworks_url_col, artworks_id_col, path):
         """
-        Scrap images of the artworks
+        Scrap images of the artworks, the letters already done in the
+        journal are skipped
 
         Args:
             gurl (str): URL for the repository to scrap data
@@ -455,19 +803,46 @@ class Controller ():
             artworks_urls = gm.getdata(artworks_url_col)
             artworks_ids = gm.getdata(artworks_id_col)
             ans = True
+
+            # download jobs of all the pending letters
+            jobs = list()
+            owners = list()
             for route, urls, ids in zip(routes, artworks_urls, artworks_ids):
-                urls = self.from_str_to_list(urls)
-                ids = self.from_str_to_list(ids)
-                if urls and ids:
-                    for url, id in zip(urls, ids):
-                        ans = ans and gm.get_artworks_images(route, url, id, path)
+                if self.journal.done(route, "images"):
+                    continue
+                try:
+                    urls = [] if self.missing(urls) else self.from_str_to_list(urls)
+                    ids = [] if self.missing(ids) else self.from_str_to_list(ids)
+                    todo = gm.artworks_jobs(route, urls, ids, path)
+                    jobs.extend(todo)
+                    owners.extend([route] * len(todo))
+                    # letters without images are done
+                    if len(todo) == 0:
+                        self.journal.mark(route, "images")
+                except Exception as exp:
+                    self.journal.mark(route, "images", exp)
+                    ans = False
+
+            # downloading all the images at once
+            results = gm.download_images(jobs, errors=True)
+            failed = dict()
+            for route, result in zip(owners, results):
+                if isinstance(result, Exception):
+                    failed[route] = result
+                else:
+                    failed.setdefault(route, None)
+
+            for route, exp in failed.items():
+                self.journal.mark(route, "images", exp)
+                ans = ans and exp is None
             return ans
         except Exception as exp:
             Err.reraise(exp, "Controller: get_artworks_images")
 
     def scrap_artworks(self, gurl, id_col, artworks_cols):
         """
-        Scrap all the artworks of a the specified letters
+        Scrap all the artworks of a the specified letters, the letters
+        already done in the journal keep their current artworks
 
         Args:
             gurl (str): URL for the repository to scrap data
@@ -484,11 +859,25 @@ class Controller ():
             gm = self.gallery
             gm.load_body(gurl)
             routes = gm.getdata(id_col)
-            ans = {col: [] for col in artworks_cols}
-            for route in routes:
-                artworks_data = gm.scrap_artworks(route)
+            ans = self.current(artworks_cols, routes)
+
+            # letters without artworks have empty columns, the journal
+            # tells if they are done
+            todo = self.pending(routes, ["artworks"], ans)
+            artworks = gm.crawl_artworks([routes[i] for i in todo],
+                                         errors=True)
+            scraped = list()
+            for i, artworks_data in zip(todo, artworks):
+                if isinstance(artworks_data, Exception):
+                    self.journal.mark(routes[i], "artworks", artworks_data)
+                    continue
                 for col, value in artworks_data.items():
-                    ans[col].append(value)
+                    if col in ans:
+                        ans[col][i] = value
+                scraped.append(i)
+                self.journal.mark(routes[i], "artworks",
+                                  empty=self.blank(ans, i))
+            gm.upsert(routes, ans, scraped)
             return ans
         except Exception as exp:
             Err.reraise(exp, "Controller: scrap_artworks")
@@ -507,7 +896,8 @@ class Controller ():
             div (str): HTML <div> keyword to search and scrap
             attrs (dict): decorative attributes in the <div> keyword to refine
             the search and scrap
-            stime (float): waiting time between requests
+            stime (float): max seconds to wait for new items after each
+            scroll of the gallery index
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -674,7 +1064,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
 
             # returning answer
             return ans
@@ -721,7 +1110,6 @@ class Controller ():
 
                 # compose answer
                 ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
 
             # returning answer
             return ans
@@ -779,8 +1167,6 @@ class Controller ():
                     tans = False
                     ans.append(tans)
 
-                time.sleep(DEFAULT_SLEEP_TIME)
-
             # returning answer
             return ans
 
@@ -830,7 +1216,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
 
             # returning answer
             return ans
@@ -878,7 +1263,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
 
             # returning answer
             return ans
@@ -935,7 +1319,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SLEEP_TIME)
 
             # returning answer
             return ans
@@ -991,7 +1374,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SHORT_SLEEP_TIME)
 
             # return answer list
             return ans
@@ -1043,7 +1425,6 @@ class Controller ():
                 # compose answer
                 tans = self.to_json(tans)
                 ans.append(tans)
-                time.sleep(DEFAULT_SHORT_SLEEP_TIME)
 
             # return answer list
             return ans
@@ -1058,12 +1439,15 @@ class Controller ():
 
         Args:
             coln (str): column name of the gallery dataframe to get
+            mutable (bool, optional): get a list copy the caller can change
+            instead of a read-only view. Default is False
 
         Raises:
             exp: raise a generic exception if something goes wrong
 
         Returns:
-            ans (list): data from the column name
+            ans (np.ndarray/list): read-only array of the data from the
+            column name, or a list copy if it is mutable
         """
         try:
             # getting the element url in the gallery
@@ -1152,26 +1536,89 @@ class Controller ():
         except Exception as exp:
             Err.reraise(exp, "Controller: save_gallery")
 
-    def load_gallery(self, fname, folder):
+    def load_gallery(self, fname, folder, columns=None):
         """
         read the gallery model (pandas) from a CSV file
 
         Args:
             fname (str): file name from where to read the gallery model
             folder (str): subfolder from where to read the CSV file
+            columns (list, optional): column names to read, Default is None
+            to read all the columns
 
         Raises:
             exp: raise a generic exception if something goes wrong
         """
         try:
             gm = self.gallery
-            ans = gm.load_gallery(fname, folder)
+            ans = gm.load_gallery(fname, folder, columns=columns)
             return ans
 
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Controller: load_gallery")
 
+    def save_frames(self, fname, folder, columns=None):
+        """
+        write the gallery model (pandas) into the binary columnar store
+
+        Args:
+            fname (str): file name of the gallery model
+            folder (str): subfolder where to write the store
+            columns (list, optional): column names to write, Default is None
+            to write all the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            gm = self.gallery
+            ans = gm.save_frames(fname, folder, columns=columns)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: save_frames")
+
+    def load_frames(self, fname, folder, columns=None):
+        """
+        read the gallery model (pandas) from the binary columnar store
+
+        Args:
+            fname (str): file name of the gallery model
+            folder (str): subfolder from where to read the store
+            columns (list, optional): column names to read, Default is None
+            to read all the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            gm = self.gallery
+            ans = gm.load_frames(fname, folder, columns=columns)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: load_frames")
+
+    def sync_database(self):
+        """
+        fill the SQLite store of the letters with the gallery model (pandas)
+        when the store is empty
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            gm = self.gallery
+            ans = gm.sync_database()
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Controller: sync_database")
+
     def check_gallery(self):
         """
         checks the data stats of the gallery dataframe
@@ -1220,7 +1667,6 @@ class Controller ():
 
                 tfile = fname + ".json"
                 self.write_json(tdata, tfile, gfolder, tindex)
-                time.sleep(DEFAULT_SHORT_SLEEP_TIME)
 
         # exception handling
         except Exception as exp:
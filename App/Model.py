@@ -24,10 +24,8 @@
 import os
 import copy
 import csv
-import re
-import unicodedata
 import urllib
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 # ===============================
 # extension python libraries
@@ -35,15 +33,32 @@ import time
 import pandas as pd
 import cv2
 
+# optional arrow CSV reader, the C engine of pandas is used without it
+try:
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
 # ===============================
 # developed python libraries
 # ===============================
 import Conf
 from Lib.Utils import Err
+from Lib.Utils.Rows import Rows
+from Lib.Utils.Frames import Frames
+from Lib.Utils.Database import Database
 from Lib.Recovery.Content import Page
 from Lib.Recovery.Cleaner import Topic
+from Lib.Recovery.Engine import Engine
+from Lib.Recovery.Downloader import Downloader
+from Lib.Recovery.Parser import DEFAULT_HTML_PARSER
 assert Topic
 assert Page
+assert Engine
+assert Downloader
+assert Rows
+assert Frames
+assert Database
 assert Err
 assert Conf
 
@@ -57,6 +72,17 @@ DATA_SCHEMA = Conf.configGlobal(CFG_FOLDER, CFG_SCHEMA)
 # default template for the element/paint dict in gallery
 DEFAULT_FRAME_SCHEMA = eval(DATA_SCHEMA.get("DEFAULT", "columns"))
 
+# pandas CSV readers, the python engine is the slowest
+CSV_ENGINES = ("c", "pyarrow", "python")
+DEFAULT_CSV_ENGINE = "c"
+
+# position of the letter texts in the print page <div class="content">
+DEFAULT_LETTER_POSITIONS = {
+    "ORIGINAL": 3,
+    "TRANSLATION": 5,
+    "NOTES": 7,
+}
+
 
 # ================================================
 # API for the scrapping the gallery of paintings
@@ -76,7 +102,23 @@ class Gallery():
     imgd_path = str()
     schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
     data_frame = pd.DataFrame(columns=DEFAULT_FRAME_SCHEMA)
+    rows = None
+    pool = None
+    engine = None
+    downloader = None
+    browser = None
+    static = True
+    dialect = DEFAULT_HTML_PARSER
+    strain = False
+    deferred = False
+    reader = DEFAULT_CSV_ENGINE
+    frames = None
+    incremental = True
+    dirty = None
+    database = None
+    topic = Topic()
     wpage = Page()
+    shapes = None
 
     # =========================================
     # functions to create a new gallery
@@ -92,6 +134,32 @@ class Gallery():
             data_frame (data_frame, optional): panda df with data (ie.: paints)
             in the gallery, you can pass an existing df, Default is empty
             wpage (Page): the current webpage the controller is scrapping
+            pool (Pool, optional): HTTP connection pool shared by all the
+            pages of the gallery
+            engine (Engine, optional): concurrent fetch engine to crawl the
+            letters, Default is an Engine() over the gallery pool
+            downloader (Downloader, optional): parallel streaming downloads
+            of the images, Default is a Downloader() over the gallery pool
+            browser (Browser, optional): headless browser pool shared by all
+            the pages of the gallery
+            static (bool, optional): scrap the artworks from the static HTML
+            and use the browser only as fallback. Default is True
+            chunk_size (int, optional): saved letters kept in the column
+            buffers before building a dataframe chunk. Default is 1000
+            dialect (str, optional): beautifulSoup parser dialect of the
+            pages, ie.: lxml. Default is "html.parser"
+            strain (bool, optional): parse only the subtrees of the scrapped
+            tags in the pages. Default is False
+            deferred (bool, optional): keep the scrapped texts raw and clean
+            them by columns with clrcolumns(). Default is False
+            reader (str, optional): CSV engine to load the gallery, ie.: c,
+            pyarrow or python. Default is "c"
+            frames (Frames, optional): binary columnar store of the gallery,
+            Default is a Frames() with compressed pickle files
+            incremental (bool, optional): save in the columnar store only the
+            columns changed since the last save or load. Default is True
+            database (Database, optional): SQLite store of the letters and
+            artworks updated with the scrapped letters. Default is None
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -107,7 +175,23 @@ class Gallery():
             self.imgd_path = str()
             self.schema = copy.deepcopy(DEFAULT_FRAME_SCHEMA)
             self.data_frame = pd.DataFrame(columns=DEFAULT_FRAME_SCHEMA)
+            self.rows = None
+            self.pool = None
+            self.engine = None
+            self.downloader = None
+            self.browser = None
+            self.static = True
+            self.dialect = DEFAULT_HTML_PARSER
+            self.strain = False
+            self.deferred = False
+            self.reader = DEFAULT_CSV_ENGINE
+            self.frames = Frames()
+            self.incremental = True
+            self.dirty = None
+            self.database = None
+            self.topic = Topic()
             self.wpage = Page()
+            self.shapes = dict()
 
             # when arguments are pass as parameters
             if len(args) > 0:
@@ -138,10 +222,100 @@ class Gallery():
                         self.schema = copy.deepcopy(kwargs[key])
                         self.data_frame = pd.DataFrame(columns=self.schema)
 
+                    # sharing the HTTP connection pool with the pages
+                    if key == "pool":
+                        self.pool = kwargs[key]
+                        self.wpage = self.new_page()
+
+                    # sharing the headless browser pool with the pages
+                    if key == "browser":
+                        self.browser = kwargs[key]
+                        self.wpage = self.new_page()
+
+                    # concurrent fetch engine for the letters
+                    if key == "engine":
+                        self.engine = kwargs[key]
+
+                    # parallel downloads of the images
+                    if key == "downloader":
+                        self.downloader = kwargs[key]
+
+                    # browserless artworks scrapping
+                    if key == "static":
+                        self.static = kwargs[key]
+
+                    # parser backend of the pages
+                    if key == "dialect":
+                        self.dialect = kwargs[key]
+                        self.wpage = self.new_page()
+
+                    # partial parsing of the pages
+                    if key == "strain":
+                        self.strain = kwargs[key]
+                        self.wpage = self.new_page()
+
+                    # column cleaning after the scrapping
+                    if key == "deferred":
+                        self.deferred = kwargs[key]
+
+                    # CSV engine to load the gallery
+                    if key == "reader":
+                        self.reader = kwargs[key]
+
+                    # binary columnar store of the gallery
+                    if key == "frames":
+                        self.frames = kwargs[key]
+
+                    # saving only the changed columns
+                    if key == "incremental":
+                        self.incremental = kwargs[key]
+
+                    # SQLite store of the letters
+                    if key == "database":
+                        self.database = kwargs[key]
+
+            # default engine sharing the gallery pool
+            if self.engine is None:
+                self.engine = Engine(pool=self.wpage.pool)
+
+            # default downloader sharing the gallery pool
+            if self.downloader is None:
+                self.downloader = Downloader(pool=self.wpage.pool)
+
+            # column buffers for the saved letters
+            self.rows = Rows(self.schema,
+                             chunk_size=kwargs.get("chunk_size", 1000))
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Gallery: __init__")
 
+    def new_page(self, *args):
+        """
+        creates a new Page() sharing the gallery HTTP connection pool,
+        headless browser pool, parser dialect and strain mode
+
+        Args:
+            url (str, optional): page url to recover. Defaults is empty str
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (Page): a new Page() object
+        """
+        try:
+            ans = Page(*args,
+                       pool=self.pool,
+                       browser=self.browser,
+                       dialect=self.dialect,
+                       strain=self.strain)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: new_page")
+
 
 # ============================================================================================================
     def build_links(self, routes):
@@ -178,8 +352,9 @@ class Gallery():
 
         """
         try:
-            self.wpage = Page(url)
-            self.wpage.load_body()
+            # the index is only searched for the letter links
+            self.wpage = self.new_page(url)
+            self.wpage.load_body(tag="a")
 
         except Exception as exp:
             Err.reraise(exp, "Gallery: load_body")
@@ -221,7 +396,7 @@ class Gallery():
         try:
             data = self.wpage.scrap_metadata(route, tag=tag, attrs=attrs)
             for key in data:
-                data[key] = self.clrtext(data[key])
+                data[key] = self.clrfield(data[key])
             return data
         except Exception as exp:
             Err.reraise(exp, "Gallery: scrap_metadata")
@@ -245,7 +420,7 @@ class Gallery():
         try:
             original_txt = self.wpage.scrap_at_position(
                 tag=tag, attrs=attrs, position=3, route=route)
-            original_txt = self.clrtext(original_txt)
+            original_txt = self.clrfield(original_txt)
             return original_txt
         except Exception as exp:
             Err.reraise(exp, "Gallery: scrap_original_text")
@@ -269,7 +444,7 @@ class Gallery():
         try:
             translation_txt = self.wpage.scrap_at_position(
                 tag=tag, attrs=attrs, position=5, route=route)
-            translation_txt = self.clrtext(translation_txt)
+            translation_txt = self.clrfield(translation_txt)
             return translation_txt
         except Exception as exp:
             Err.reraise(exp, "Gallery: scrap_translation_text")
@@ -293,11 +468,98 @@ class Gallery():
         try:
             notes_txt = self.wpage.scrap_at_position(
                 tag=tag, attrs=attrs, position=7, route=route)
-            notes_txt = self.clrtext(notes_txt)
+            notes_txt = self.clrfield(notes_txt)
             return notes_txt
         except Exception as exp:
             Err.reraise(exp, "Gallery: scrap_notes_text")
 
+    def scrap_letter(self, route, tag="div", attrs={"class": "content"}):
+        """
+        Scrap the metadata and the texts (ORIGINAL, TRANSLATION, NOTES) of a
+        specific letter requesting and parsing its print page only once
+
+        Args:
+            route (str): Letter ID to scrap data
+            tag (str): HTML <tag> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): dict with the metadata and the texts of the letter
+        """
+        try:
+            data = self.wpage.scrap_letter(route,
+                                           tag=tag,
+                                           attrs=attrs,
+                                           positions=DEFAULT_LETTER_POSITIONS)
+            for key in data:
+                data[key] = self.clrfield(data[key])
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrap_letter")
+
+    def crawl_letters(self, routes, tag="div", attrs={"class": "content"},
+                      errors=False):
+        """
+        Scrap the metadata and the texts (ORIGINAL, TRANSLATION, NOTES) of
+        many letters at once, requesting their print pages concurrently with
+        the gallery Engine()
+
+        Args:
+            routes (list): Letter IDs to scrap data
+            tag (str): HTML <tag> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+            errors (bool, optional): return the exception of a failed letter
+            in its place instead of raising it. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list with the data dict of each letter, in the same
+            order of the routes
+        """
+        try:
+            urls = [self.wpage.letter_path(route) for route in routes]
+            ans = self.engine.map(
+                lambda response: self.parse_letter(response, tag, attrs),
+                urls, errors=errors)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: crawl_letters")
+
+    def parse_letter(self, response, tag="div", attrs={"class": "content"}):
+        """
+        Parse and clean the metadata and the texts of an already requested
+        letter print page
+
+        Args:
+            response (requests.Response): response of the letter print page
+            tag (str): HTML <tag> keyword to search and scrap
+            attrs (dict): decorative attributes in the <div> keyword to refine
+            the search and scrap
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): dict with the metadata and the texts of the letter
+        """
+        try:
+            data = self.wpage.parse_letter(response.text,
+                                           tag=tag,
+                                           attrs=attrs,
+                                           positions=DEFAULT_LETTER_POSITIONS)
+            for key in data:
+                data[key] = self.clrfield(data[key])
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: parse_letter")
+
     def scrap_all_data(self, route):
         """
         Scrap all the data of a specific letter
@@ -312,37 +574,67 @@ class Gallery():
             data (dict): dict with all the data of the specified letter
         """
         try:
-            data = self.scrap_metadata(
+            data = self.scrap_letter(
                 route, tag="div", attrs={"class": "content"})
-            time.sleep(2)
+            self.clrrecords([data])
+            data.update(self.scrap_artworks_data(route))
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrap_all_data")
 
-            data['ORIGINAL'] = self.scrap_original_text(
-                tag="div", attrs={"class": "content"}, route=route)
-            time.sleep(2)
+    def scrap_artworks_data(self, route):
+        """
+        Scrap the artworks of a specific letter, clean their data and
+        download their images
 
-            data['TRANSLATION'] = self.scrap_translation_text(
-                tag="div", attrs={"class": "content"}, route=route)
-            time.sleep(2)
+        Args:
+            route (str): Letter ID to scrap data
 
-            data['NOTES'] = self.scrap_notes_text(
-                tag="div", attrs={"class": "content"}, route=route)
-            time.sleep(2)
+        Raises:
+            exp: raise a generic exception if something goes wrong
 
+        Returns:
+            data (dict): dict with the artworks columns of the letter
+        """
+        try:
             artworks = self.scrap_artworks(route)
+            data = self.artworks_data(route, artworks)
+            return data
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: scrap_artworks_data")
+
+    def artworks_data(self, route, artworks):
+        """
+        Clean the already scraped artworks of a specific letter and
+        download their images
 
+        Args:
+            route (str): Letter ID of the artworks
+            artworks (dict): artworks of the letter, see scrap_artworks()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): dict with the artworks columns of the letter
+        """
+        try:
+            data = dict()
+
+            # the titles are cleaned before joining them, clrtext() drops ","
             for key in artworks:
                 if key != "ARTWORKSLINK":
-                    for i in range(len(artworks[key])):
-                        artworks[key][i] = self.clrtext(artworks[key][i])
+                    artworks[key] = self.topic.clrcolumn(artworks[key])
                 data[key] = ", ".join(artworks[key])
 
-            for link, imgf in zip(artworks["ARTWORKSLINK"], artworks["ARTWORKSID"]):
-                if len(link) and len(imgf):
-                    self.get_artworks_images(route, link, imgf)
+            jobs = self.artworks_jobs(route,
+                                      artworks["ARTWORKSLINK"],
+                                      artworks["ARTWORKSID"])
+            self.download_images(jobs)
 
             return data
         except Exception as exp:
-            Err.reraise(exp, "Gallery: scrap_all_data")
+            Err.reraise(exp, "Gallery: artworks_data")
 
     def scrap_artworks(self, route):
         """
@@ -358,11 +650,78 @@ class Gallery():
             ans (dict): dict with the different artworks with their respective links
         """
         try:
-            ans = self.wpage.scrap_artworks(route)
+            if self.static:
+                ans = self.wpage.scrap_artworks_static(route)
+            else:
+                ans = self.wpage.scrap_artworks(route)
             return ans
         except Exception as exp:
             Err.reraise(exp, "Gallery: scrap_artworks")
 
+    def parse_artworks(self, response):
+        """
+        Parse the artworks of an already requested letter page
+
+        Args:
+            response (requests.Response): response of the letter page
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): dict with the artworks of the letter, None if they are
+            only available with a browser
+        """
+        try:
+            ans = self.wpage.parse_artworks(response.text, response.url)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: parse_artworks")
+
+    def crawl_artworks(self, routes, errors=False):
+        """
+        Scrap the artworks of many letters at once, in static mode the letter
+        pages are requested concurrently with the gallery Engine(), the
+        browser pool scraps one letter per browser for the rest
+
+        Args:
+            routes (list): Letter IDs to scrap data
+            errors (bool, optional): return the exception of a failed letter
+            in its place instead of raising it. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list with the artworks dict of each letter, in the
+            same order of the routes
+        """
+        try:
+            ans = [None] * len(routes)
+
+            if self.static:
+                urls = [self.wpage.letter_path(route, page="letter.html")
+                        for route in routes]
+                ans = self.engine.map(self.parse_artworks, urls,
+                                      errors=errors)
+
+            # letters that need a browser
+            pending = [i for i in range(len(routes)) if ans[i] is None]
+            if len(pending) > 0:
+                workers = self.wpage.browser.size
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    found = [executor.submit(self.wpage.scrap_artworks,
+                                             routes[i]) for i in pending]
+                    for i, future in zip(pending, found):
+                        if errors and future.exception() is not None:
+                            ans[i] = future.exception()
+                        else:
+                            ans[i] = future.result()
+
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: crawl_artworks")
+
     def get_artworks_images(self, route, url, imgf, path="Artworks/"):
         """
         Scrap images of the artworks
@@ -380,17 +739,70 @@ class Gallery():
             imgf_artwork (bool): True if the file was downloaded in the local filepath, false if not
         """
         try:
-            gfolder = os.path.join(path,route) 
-            if not os.path.exists(gfolder):
-                os.mkdir(gfolder)
-            imgf_artwork = self.get_imgf(gfolder, url, imgf)
+            jobs = self.artworks_jobs(route, [url], [imgf], path)
+            imgf_artwork = all(self.download_images(jobs))
             return imgf_artwork
         except Exception as exp:
             Err.reraise(exp, "Gallery: get_artworks_images")
 
+    def artworks_jobs(self, route, urls, imgfs, path="Artworks/"):
+        """
+        Build the download jobs of the images of the artworks of a letter,
+        the folder of the letter is created if needed
+
+        Args:
+            route (str): Letter ID of the artworks
+            urls (list): urls of the artworks images
+            imgfs (list): filenames of the artworks pictures
+            path (str): path to store artwork. Optional, default is Artworks/
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            jobs (list): tuples with the url and the local filepath of each
+            image
+        """
+        try:
+            jobs = list()
+            gfolder = os.path.join(path, route)
+            for url, imgf in zip(urls, imgfs):
+                if len(url) and len(imgf):
+                    jobs.append((url, os.path.join(gfolder, imgf+".jpg")))
+
+            if len(jobs) > 0:
+                os.makedirs(gfolder, exist_ok=True)
+            return jobs
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: artworks_jobs")
+
+    def download_images(self, jobs, errors=False):
+        """
+        Download many images at once streaming them to disk, see
+        Downloader.map()
+
+        Args:
+            jobs (list): tuples with the url and the local filepath of each
+            image, see artworks_jobs()
+            errors (bool, optional): return the exception of a failed image
+            in its place instead of raising it. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): True or the exception of each image
+        """
+        try:
+            ans = self.downloader.map(jobs, errors=errors)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: download_images")
+
     def save(self, data):
         """
-        Inserts the data from one letter in the dataframe with all the letters data
+        Inserts the data from one letter in the column buffers, the letters
+        are joined to the dataframe all at once with flush()
 
         Args:
             data (dict): Dict with the data of a letter
@@ -398,10 +810,25 @@ class Gallery():
             exp: raise a generic exception if something goes wrong
         """
         try:
-            self.data_frame = self.data_frame.append(data, ignore_index=True)
+            self.rows.add(data)
         except Exception as exp:
             Err.reraise(exp, "Gallery: save")
 
+    def flush(self):
+        """
+        Joins the letters waiting in the column buffers at the end of the
+        dataframe with all the letters data
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if self.rows.pending() > 0:
+                self.data_frame = self.rows.build(self.data_frame)
+                self.touch()
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: flush")
+
     def write_pc(self, name="letters"):
         """
         Exports the dataframe as csv file
@@ -416,6 +843,7 @@ class Gallery():
             ans (dict): dict with the different metadata attributes
         """
         try:
+            self.flush()
             self.data_frame.to_csv(name+".csv")
         except Exception as exp:
             Err.reraise(exp, "Gallery: write_pc")
@@ -437,7 +865,8 @@ class Gallery():
             div (str): HTML <div> keyword to search and scrap
             attrs (dict): decorative attributes in the <div> keyword to refine
             the search and scrap
-            stime (float): waiting time between requests
+            stime (float): max seconds to wait for new items after each
+            scroll of the gallery index
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -447,7 +876,7 @@ class Gallery():
         """
         try:
             # reset working web page
-            self.wpage = Page()
+            self.wpage = self.new_page()
             ans = None
 
             # getting the basic element list from gallery online index
@@ -512,12 +941,115 @@ class Gallery():
                 self.data_frame[col] = td
                 ans = True
 
+            self.touch()
             return ans
 
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Gallery: newidx")
 
+    def route_key(self, route):
+        """
+        comparable key of a letter ID, the numeric IDs loaded from a CSV
+        file lose their leading zeros (ie.: 001 is 1)
+
+        Args:
+            route (str/int): letter ID
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): key of the letter ID
+        """
+        try:
+            ans = str(route).strip()
+            if ans.isdigit():
+                ans = str(int(ans))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: route_key")
+
+    def diffidx(self, id_col, routes):
+        """
+        compares the freshly scrapped letter IDs with the IDs already in
+        the dataframe (ie.: loaded from the CSV file)
+
+        Args:
+            id_col (str): df-schema column name of the ID
+            routes (list): scrapped letter IDs
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): new IDs not in the dataframe and IDs in the
+            dataframe that are not in the gallery anymore, in their order
+        """
+        try:
+            self.flush()
+            current = list()
+            if id_col in self.data_frame.columns:
+                current = self.getdata(id_col)
+
+            known = set(self.route_key(route) for route in current)
+            fresh = set(self.route_key(route) for route in routes)
+
+            added = [route for route in routes
+                     if self.route_key(route) not in known]
+            removed = [route for route in current
+                       if self.route_key(route) not in fresh]
+            ans = (added, removed)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: diffidx")
+
+    def patchidx(self, cols, added, links, removed):
+        """
+        updates the dataframe index with only the changes of the gallery,
+        the removed letters are dropped and the new ones are appended with
+        their URLs, the rest of the letters keep all their data
+
+        Args:
+            cols (list): df-schema column names of the ID and the URL
+            added (list): new letter IDs
+            links (list): URLs of the new letters
+            removed (list): letter IDs not in the gallery anymore
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): true if the dataframe changed, false otherwise
+        """
+        try:
+            ans = False
+            id_col, url_col = cols[0], cols[1]
+            self.flush()
+
+            if len(removed) > 0:
+                drop = self.data_frame[id_col].isin(removed)
+                self.data_frame = self.data_frame[~drop]
+                self.data_frame = self.data_frame.reset_index(drop=True)
+                ans = True
+
+            for route, link in zip(added, links):
+                self.save({id_col: route, url_col: link})
+                ans = True
+
+            self.flush()
+            if ans:
+                self.touch()
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: patchidx")
+
     def get_idxid(self, gsoup, ide, clean):
         # TODO: remove after implement the Topic() class
         """
@@ -647,10 +1179,10 @@ class Gallery():
         try:
 
             # reset working web page
-            self.wpage = Page()
+            self.wpage = self.new_page()
 
             # get the body of the element url
-            rstatus = self.wpage.get_body(eurl)
+            rstatus = self.wpage.get_body(eurl, tag=div, attrs=attrs)
             ans = None
 
             if rstatus == 200:
@@ -685,7 +1217,7 @@ class Gallery():
         try:
 
             # reset working web page
-            self.wpage = Page()
+            self.wpage = self.new_page()
 
             # get the headers and the content from the url
             rstatus = self.wpage.get_header(eurl)
@@ -757,19 +1289,8 @@ class Gallery():
             # default answer
             ans = False
             fp = os.path.join(gfolder, imgf+".jpg") #gfolder+"\\" + imgf+".jpg"
-            # if the file doesnt exists
-            if not os.path.exists(fp):
-                # saving file from content requests in bit form
-                data = self.wpage.get_image(dlurl)
-                with open(fp, "wb") as file:
-                    file.write(data)
-                    file.close()
-                    ans = True
-                    return ans
-            # if the file already exists
-            elif os.path.exists(fp):
-                ans = True
-                return ans
+            # streaming the file, skipped if the server did not change it
+            ans = self.downloader.fetch(dlurl, fp)
             # returning answer
             return ans
 
@@ -794,7 +1315,9 @@ class Gallery():
         """
         try:
             ans = False
+            self.flush()
             self.data_frame[column] = data
+            self.touch(column)
             if self.data_frame[column] is not None:
                 ans = True
             return ans
@@ -807,23 +1330,40 @@ class Gallery():
     # consult functions
     # =========================================
 
-    def getdata(self, column):
+    def getdata(self, column, mutable=False):
         """
-        gets the data from a given column name, returning a list
+        gets the data from a given column name, by default a read-only
+        array of the column, the object and python string columns (ie.:
+        texts) share the dataframe memory, the other columns (ie.: ints,
+        pyarrow strings) are converted into a new array of python values
 
         Args:
             column (str): name of the column in the dataframe to update
+            mutable (bool, optional): return a new list the caller can
+            change. Default is False
 
         Raises:
             exp: raise a generic exception if something goes wrong
 
         Returns:
-            ans (list): formated copy of the data in the dataframe
+            ans (np.ndarray/list): read-only array of the data in the
+            dataframe, or a list copy if it is mutable
         """
         try:
+            self.flush()
+            data = self.data_frame[column]
+
+            if mutable:
+                ans = data.tolist()
+                return ans
 
-            ans = copy.deepcopy(self.data_frame[column])
-            ans = list(ans)
+            # object columns share their values, the rest are boxed as
+            # python values (ie.: int IDs) like in a list
+            ans = data.to_numpy()
+            if ans.dtype != object:
+                ans = ans.astype(object)
+            ans = ans.view()
+            ans.flags.writeable = False
             return ans
 
         # exception handling
@@ -841,6 +1381,7 @@ class Gallery():
             ans (dataframe.info()): pandas dataframe description
         """
         try:
+            self.flush()
             self.data_frame.info()
             # return ans
 
@@ -867,8 +1408,9 @@ class Gallery():
             ans (dataframe.info()): pandas dataframe description
         """
         try:
-
+            self.flush()
             self.data_frame[column] = data
+            self.touch(column)
             ans = self.data_frame.info()
             return ans
 
@@ -895,6 +1437,7 @@ class Gallery():
         try:
             # pandas function to save dataframe in CSV file
             ans = False
+            self.flush()
             gfp = os.path.join(os.getcwd(), dfolder, fn)
             tdata = self.data_frame.to_csv(
                 gfp,
@@ -906,20 +1449,29 @@ class Gallery():
             )
             if tdata is None:
                 ans = True
+
+            # a store in sync keeps being newer than the exported CSV
+            if self.dirty is not None and len(self.dirty) == 0:
+                self.frames.stamp(self.frames_path(fn, dfolder))
             return ans
 
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Gallery: save_gallery")
 
-    def load_gallery(self, fn, dfolder):
+    def load_gallery(self, fn, dfolder, columns=None):
         """
-        loads the gallery from a CSV file in UTF-8 encoding
+        loads the gallery from a CSV file in UTF-8 encoding, the C and
+        pyarrow engines read the quoted multi-line texts as the python
+        engine does but much faster
 
         Args:
             fn (str): file name with .csv extension
             dfolder (file-object): valid dirpath str or array with
             valid folders.
+            columns (list, optional): column names to read, a partial
+            gallery must not be saved over the complete CSV file. Default is
+            None to read all the columns
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -928,13 +1480,29 @@ class Gallery():
             # read an existing CSV fileto update the dataframe
             ans = False
             gfp = os.path.join(os.getcwd(), dfolder, fn)
-            self.data_frame = pd.read_csv(
-                gfp,
-                sep=",",
-                encoding="utf-8",
-                engine="python",
-                quoting=csv.QUOTE_ALL
-            )
+            engine = self.reader
+
+            # without pyarrow the C engine reads the gallery
+            if engine not in CSV_ENGINES:
+                engine = DEFAULT_CSV_ENGINE
+            if engine == "pyarrow" and pacsv is None:
+                engine = DEFAULT_CSV_ENGINE
+
+            if engine == "pyarrow":
+                self.data_frame = self.read_arrow(gfp, columns)
+
+            else:
+                self.data_frame = pd.read_csv(
+                    gfp,
+                    sep=",",
+                    encoding="utf-8",
+                    engine=engine,
+                    quoting=csv.QUOTE_ALL,
+                    usecols=columns
+                )
+
+            # the CSV may be newer than the columnar store
+            self.touch()
             if self.data_frame is not None:
                 ans = True
             return ans
@@ -943,6 +1511,273 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: load_gallery")
 
+    def read_arrow(self, gfp, columns=None):
+        """
+        reads a gallery CSV file with the multithreaded pyarrow reader, the
+        quoted texts can have new lines inside
+
+        Args:
+            gfp (str): local filepath of the CSV file
+            columns (list, optional): column names to read. Default is None
+            to read all the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (data_frame): pandas df with the gallery data
+        """
+        try:
+            popts = pacsv.ParseOptions(delimiter=",",
+                                       newlines_in_values=True)
+            copts = pacsv.ConvertOptions()
+            if columns is not None:
+                copts = pacsv.ConvertOptions(include_columns=list(columns))
+
+            table = pacsv.read_csv(gfp,
+                                   parse_options=popts,
+                                   convert_options=copts)
+            ans = table.to_pandas()
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: read_arrow")
+
+    def touch(self, *columns):
+        """
+        marks the columns changed since the last save or load of the
+        columnar store
+
+        Args:
+            columns (str, optional): column names changed, without them all
+            the columns are changed (ie.: rows added or removed)
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if len(columns) == 0:
+                self.dirty = None
+            elif self.dirty is not None:
+                self.dirty.update(columns)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: touch")
+
+    def changed(self):
+        """
+        gets the columns changed since the last save or load of the
+        columnar store in the dataframe order
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): changed column names, None if all the columns
+            changed
+        """
+        try:
+            ans = None
+            if self.dirty is not None:
+                ans = [col for col in self.data_frame.columns
+                       if col in self.dirty]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: changed")
+
+    def frames_path(self, fn, dfolder):
+        """
+        gets the local dirpath of the binary columnar store of a gallery
+        file, a folder named after the file without its extension
+
+        Args:
+            fn (str): file name with .csv extension
+            dfolder (file-object): valid dirpath str or array with
+            valid folders.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): local dirpath of the columnar store
+        """
+        try:
+            name = os.path.splitext(fn)[0]
+            ans = os.path.join(os.getcwd(), dfolder, name)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: frames_path")
+
+    def save_frames(self, fn, dfolder, columns=None):
+        """
+        save the in memory dataframe into the binary columnar store, one
+        compressed file per column, in incremental mode only the columns
+        changed since the last save or load are written
+
+        Args:
+            fn (str): file name with .csv extension
+            dfolder (file-object): valid dirpath str or array with
+            valid folders.
+            columns (list, optional): column names to replace or append,
+            the other stored columns are not rewritten. Default is None to
+            save the changed columns or all of them
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the columns were saved
+        """
+        try:
+            ans = False
+            self.flush()
+            gfp = self.frames_path(fn, dfolder)
+
+            if columns is None and self.incremental:
+                columns = self.changed()
+
+            cols = self.frames.save(gfp, self.data_frame, columns)
+            if cols is not None:
+                self.dirty = set()
+                ans = True
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: save_frames")
+
+    def load_frames(self, fn, dfolder, columns=None):
+        """
+        loads the gallery from the binary columnar store, the store is not
+        loaded if the CSV file of the gallery was changed after it
+
+        Args:
+            fn (str): file name with .csv extension
+            dfolder (file-object): valid dirpath str or array with
+            valid folders.
+            columns (list, optional): column names to read, a partial
+            gallery must not be saved over the complete store. Default is
+            None to read all the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the gallery was loaded, False if the store
+            does not exist or it is older than the CSV file
+        """
+        try:
+            ans = False
+            gfp = self.frames_path(fn, dfolder)
+            saved = self.frames.modified(gfp)
+
+            # the CSV was edited, replaced or exported after the store
+            cfp = os.path.join(os.getcwd(), dfolder, fn)
+            if saved is not None and os.path.exists(cfp):
+                if os.path.getmtime(cfp) > saved:
+                    saved = None
+
+            if saved is not None:
+                self.data_frame = self.frames.load(gfp, columns)
+                self.dirty = set()
+                ans = True
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: load_frames")
+
+    def sync_database(self):
+        """
+        fills the SQLite store with the in memory dataframe when the store
+        is empty, a filled store is kept up to date by upsert()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters written
+        """
+        try:
+            ans = 0
+            self.flush()
+            if self.database is not None and self.database.count() == 0:
+                ans = self.database.from_frame(self.data_frame)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: sync_database")
+
+    def upsert(self, routes, data, positions=None):
+        """
+        writes the scrapped columns of some letters in the SQLite store in
+        one transaction
+
+        Args:
+            routes (list): letter IDs
+            data (dict): list of values of each column, in the same order of
+            the routes
+            positions (list, optional): positions of the letters to write.
+            Default is None to write all the letters
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters written
+        """
+        try:
+            ans = 0
+            if self.database is None:
+                return ans
+
+            if positions is None:
+                positions = range(len(routes))
+
+            key = self.database.key
+            records = list()
+            for i in positions:
+                record = {col: data[col][i] for col in data}
+                record[key] = routes[i]
+                records.append(record)
+
+            ans = self.database.upsert(records)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: upsert")
+
+    def forget(self, routes):
+        """
+        deletes some letters and their artworks from the SQLite store
+
+        Args:
+            routes (list): letter IDs
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters deleted
+        """
+        try:
+            ans = 0
+            if self.database is not None and len(routes) > 0:
+                ans = self.database.delete(routes)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: forget")
+
     def export_imgs(self, sfpn, tfpn, tsufix):
         """
         Export images from source files into target files with CV2
@@ -976,6 +1811,10 @@ class Gallery():
                 # iterating in the source files
                 for sf in sfpn:
 
+                    # opening the source file only once
+                    sdf = cv2.imread(sf, cv2.IMREAD_UNCHANGED)
+                    gdf = None
+
                     # iterating in the target files paths and keys
                     for tf, key in zip(tfpn, tsufix.keys()):
                         # default temporal variables
@@ -985,23 +1824,30 @@ class Gallery():
                         # checking if is RGB
                         # if any("rgb" in s for s in (tf, key)):
                         if "rgb" in tf:
-                            # opening the source file
-                            tdf = cv2.imread(sf, cv2.IMREAD_UNCHANGED)
-                            # exporting/saving to RBG file
-                            complete = cv2.imwrite(tf, tdf)
+                            tdf = sdf
 
                         # checking if is B&W
                         # elif any("bw" in s for s in (tf, key)):
                         elif "bw" in tf:
-                            # opening the source file
-                            tdf = cv2.imread(sf, cv2.IMREAD_GRAYSCALE)
-                            # convert = cv2.COLOR_BGR2GRAY
-                            # tdf = cv2.cvtColor(tdf, convert)
-                            # exporting/saving to B&W file
+                            # converting the decoded source in memory
+                            if gdf is None:
+                                gdf = self.grayscale(sdf)
+                            tdf = gdf
+
+                        # exporting/saving the RGB or B&W file
+                        if tdf is not None:
                             complete = cv2.imwrite(tf, tdf)
 
                         # updating answer dict
                         if complete is True:
+                            # remembering the shape for export_shapes(),
+                            # JPEG files drop the alpha channel
+                            tshape = list(tdf.shape)
+                            jpg = tf.lower().endswith((".jpg", ".jpeg"))
+                            if jpg and len(tshape) == 3 and tshape[2] == 4:
+                                tshape[2] = 3
+                            self.shapes[os.path.normpath(tf)] = tshape
+
                             # recovering the important relative path
                             tf = os.path.normpath(tf)
                             tf = tf.split(os.sep)
@@ -1018,6 +1864,33 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: export_imgs")
 
+    def grayscale(self, sdf):
+        """
+        Convert an already decoded image into grayscale with CV2
+
+        Args:
+            sdf (np.array): decoded image, gray, BGR or BGRA
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (np.array): grayscale image
+        """
+        try:
+            ans = sdf
+            if sdf.ndim == 3 and sdf.shape[2] == 4:
+                ans = cv2.cvtColor(sdf, cv2.COLOR_BGRA2GRAY)
+            elif sdf.ndim == 3 and sdf.shape[2] == 3:
+                ans = cv2.cvtColor(sdf, cv2.COLOR_BGR2GRAY)
+            elif sdf.ndim == 3:
+                ans = sdf[:, :, 0]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: grayscale")
+
     def export_shapes(self, tfpn, tsufix):
         """
         Export images from source files into target files with CV2
@@ -1054,9 +1927,14 @@ class Gallery():
                         complete = False
                         tshape = list()
 
+                        # shape recorded when the file was exported
+                        if os.path.normpath(tf) in self.shapes:
+                            tshape = self.shapes[os.path.normpath(tf)]
+                            complete = True
+
                         # checking if it is RGB
                         # if any("rgb" in s for s in (tf, key)):
-                        if "rgb" in tf:
+                        elif "rgb" in tf:
                             # opening file in RBG
                             tdf = cv2.imread(tf, cv2.IMREAD_UNCHANGED)
                             # exporting/saving to RBG shape
@@ -1065,7 +1943,7 @@ class Gallery():
 
                         # checking if it is B&W
                         # elif any("bw" in s for s in (tf, key)):
-                        if "bw" in tf:
+                        elif "bw" in tf:
                             # opening file in B&W
                             tdf = cv2.imread(tf, cv2.IMREAD_GRAYSCALE)
                             # exporting/saving to B&W shape
@@ -1211,21 +2089,21 @@ class Gallery():
 
                     # finding all description paragraphs <p> in the soup
                     description = soup[0].findAll(elem[1])
+                    keys = list()
+                    values = list()
                     for element in description:
 
                         key = element.attrs.get(clean[0])[0]
                         key = str(key)
-                        key = key.replace(clean[1], "", 1)
-                        key = self.clrtext(key)
+                        keys.append(key.replace(clean[1], "", 1))
+                        values.append(str(element.string).strip())
 
-                        value = str(element.string).strip()
-                        value = self.clrtext(value)
-
-                        # creating the dict to return to save as JSON
-                        td = {key: value}
+                    # cleaning all the paragraphs at once
+                    keys = self.topic.clrcolumn(keys)
+                    values = self.topic.clrcolumn(values)
 
-                        # updating answer dict
-                        ans.update(copy.deepcopy(td))
+                    # updating answer dict to save as JSON
+                    ans.update(zip(keys, values))
 
                     # getting description text section
                     key = soup[1]
@@ -1358,20 +2236,15 @@ class Gallery():
                 # soup keys and values must have data
                 if len(keys) > 0 and len(values) > 0:
 
-                    # looping over the <dt> and <dd> data
-                    for key, value in zip(keys, values):
+                    # cleaning the <dt> and <dd> data all at once
+                    size = min(len(keys), len(values))
+                    keys = [str(key.string) for key in keys[:size]]
+                    values = [str(value.string) for value in values[:size]]
+                    keys = self.topic.clrcolumn(keys)
+                    values = self.topic.clrcolumn(values)
 
-                        # cleaning data for dictionary
-                        key = str(key.string)
-                        key = self.clrtext(key)
-
-                        value = str(value.string)
-                        value = self.clrtext(value)
-
-                        # temp dict for complete answer
-                        td = {key: value}
-                        # updating answer dict
-                        ans.update(copy.deepcopy(td))
+                    # updating answer dict
+                    ans.update(zip(keys, values))
 
             # returning answer
             return ans
@@ -1468,11 +2341,10 @@ class Gallery():
         except Exception as exp:
             Err.reraise(exp, "Gallery: clean_dlurl")
 
-    def clrtext(self, text):
-        # TODO: remove after implement the Topic() class
+    def clrfield(self, text):
         """
-        clean text from HTML, remove all inconvinient characters such as:
-        extra spaces, extra end-of-line, and non utf-8 characters
+        clean a scrapped text, when the cleaning is deferred the text is kept
+        raw to be cleaned later with the rest of its column
 
         Args:
             text (str): text to clean
@@ -1481,44 +2353,101 @@ class Gallery():
             exp: raise a generic exception if something goes wrong
 
         Returns:
-            ans(str): clean text
+            ans(str): clean text, or the raw text if the cleaning is deferred
+        """
+        try:
+            ans = text
+            if not self.deferred:
+                ans = self.clrtext(text)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: clrfield")
+
+    def clrcolumns(self, data, positions=None):
+        """
+        clean the raw texts of the scrapped columns all at once, see
+        Topic.clrcolumn(), only the given positions are cleaned because the
+        rest of the values are already clean
+
+        Args:
+            data (dict): dict with a list of values for each column
+            positions (list, optional): positions of the raw values in the
+            lists. Default is None, all the values
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            data (dict): the same dict with the clean values
         """
         try:
-            # asigning text as ans
-            ans = str(text)
+            if self.deferred:
+                for col in data:
+                    values = data[col]
+                    idx = positions
+                    if idx is None:
+                        idx = range(len(values))
+                    clean = self.topic.clrcolumn([values[i] for i in idx])
+                    for i, value in zip(idx, clean):
+                        values[i] = value
+            return data
 
-            # attempt striping
-            ans = ans.strip()
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: clrcolumns")
 
-            # fix encoding
-            ans = unicodedata.normalize('NFD', ans)
-            ans = ans.encode('ascii', 'ignore')
-            ans = ans.decode("utf-8")
-            ans = str(ans)
+    def clrrecords(self, records):
+        """
+        clean the raw texts of a list of scrapped records (ie.: letters) by
+        columns, see clrcolumns()
 
-            # removing extra spaces
-            ans = re.sub(r" \s+", " ", ans)
-            # removing newlines
-            ans = re.sub(r"\n", ". ", ans)
-            ans = re.sub(r"\r", ". ", ans)
+        Args:
+            records (list): dicts with the raw values of each record
 
-            # remove pesky single quote
-            ans = re.sub(r"'", "", ans)
-            ans = re.sub(r"’", "", ans)
+        Raises:
+            exp: raise a generic exception if something goes wrong
 
-            # HTML weird leftovers
-            ans = re.sub(r"None{1,3}", " ", ans)
+        Returns:
+            records (list): the same records with the clean values
+        """
+        try:
+            if self.deferred:
+                # positions of the records with each column
+                columns = dict()
+                for i, record in enumerate(records):
+                    for key in record:
+                        columns.setdefault(key, list()).append(i)
+
+                for key, idx in columns.items():
+                    values = [records[i][key] for i in idx]
+                    clean = self.topic.clrcolumn(values)
+                    for i, value in zip(idx, clean):
+                        records[i][key] = value
+            return records
 
-            # Remove some punctuations
-            ans = re.sub(r";", "", ans)
-            ans = re.sub(r",", "", ans)
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Gallery: clrrecords")
+
+    def clrtext(self, text):
+        """
+        clean text from HTML, remove all inconvinient characters such as:
+        extra spaces, extra end-of-line, and non utf-8 characters, see
+        Topic.clrtext()
+
+        Args:
+            text (str): text to clean
 
-            # final cast and rechecking
-            ans = str(ans)
-            # ans = re.sub(r"\W", " ", ans)
-            ans = re.sub(r" \s+", " ", ans)
+        Raises:
+            exp: raise a generic exception if something goes wrong
 
-            # return answer
+        Returns:
+            ans(str): clean text
+        """
+        try:
+            ans = self.topic.clrtext(text)
             return ans
 
         # exception handling
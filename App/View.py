@@ -36,8 +36,28 @@ import copy
 import Conf
 from App.Controller import Controller
 from App.Model import Gallery
+from Lib.Recovery.Pool import Pool
+from Lib.Recovery.Cache import Cache
+from Lib.Recovery.Limiter import Limiter
+from Lib.Recovery.Engine import Engine
+from Lib.Recovery.Downloader import Downloader
+from Lib.Recovery.Store import Store
+from Lib.Recovery.Browser import Browser
+from Lib.Utils.Journal import Journal
+from Lib.Utils.Frames import Frames
+from Lib.Utils.Database import Database
 assert Controller
 assert Gallery
+assert Pool
+assert Cache
+assert Limiter
+assert Engine
+assert Downloader
+assert Store
+assert Browser
+assert Journal
+assert Frames
+assert Database
 assert Conf
 assert re
 
@@ -82,6 +102,70 @@ srcf = CFG_DATA_APP.get("Paths", "sourceFolder")
 dataf = CFG_DATA_APP.get("Paths", "dataFolder")
 imgf = CFG_DATA_APP.get("Paths", "imageFolder")
 
+# keep-alive HTTP connection pool config for the requests
+pool_conn = CFG_DATA_APP.getint("Session", "poolConnections")
+pool_size = CFG_DATA_APP.getint("Session", "poolMaxsize")
+pool_block = CFG_DATA_APP.getboolean("Session", "poolBlock")
+pool_retries = CFG_DATA_APP.getint("Session", "maxRetries")
+pool_timeout = (CFG_DATA_APP.getfloat("Session", "connectTimeout"),
+                CFG_DATA_APP.getfloat("Session", "readTimeout"))
+
+# persistent HTTP response cache config
+cache_on = CFG_DATA_APP.getboolean("Cache", "enabled")
+cachef = CFG_DATA_APP.get("Cache", "cacheFolder")
+cache_age = CFG_DATA_APP.getfloat("Cache", "maxAge")
+
+# adaptive rate limiter config for the requests of each host
+limiter_rate = CFG_DATA_APP.getfloat("Limiter", "rate")
+limiter_min = CFG_DATA_APP.getfloat("Limiter", "minRate")
+limiter_max = CFG_DATA_APP.getfloat("Limiter", "maxRate")
+limiter_burst = CFG_DATA_APP.getint("Limiter", "burst")
+limiter_slow = CFG_DATA_APP.getfloat("Limiter", "slowLatency")
+
+# parser backend config for the HTML pages
+parser_dialect = CFG_DATA_APP.get("Parser", "dialect")
+parser_strain = CFG_DATA_APP.getboolean("Parser", "strain")
+
+# asyncio fetch engine config to crawl the letters
+engine_conc = CFG_DATA_APP.getint("Engine", "concurrency")
+engine_hlimit = CFG_DATA_APP.getint("Engine", "hostLimit")
+engine_hdelay = CFG_DATA_APP.getfloat("Engine", "hostDelay")
+
+# parallel streaming downloads config for the images
+dl_workers = CFG_DATA_APP.getint("Downloader", "workers")
+dl_hlimit = CFG_DATA_APP.getint("Downloader", "hostLimit")
+dl_chunk = CFG_DATA_APP.getint("Downloader", "chunkSize")
+dl_verify = CFG_DATA_APP.getboolean("Downloader", "verify")
+dl_dedup = CFG_DATA_APP.getboolean("Downloader", "dedup")
+storef = CFG_DATA_APP.get("Downloader", "storeFolder")
+
+# headless browser pool config to scrap the artworks
+browser_size = CFG_DATA_APP.getint("Browser", "poolSize")
+browser_headless = CFG_DATA_APP.getboolean("Browser", "headless")
+browser_uses = CFG_DATA_APP.getint("Browser", "maxUses")
+browser_timeout = CFG_DATA_APP.getint("Browser", "loadTimeout")
+
+# browserless artworks scrapping config
+artworks_static = CFG_DATA_APP.getboolean("Artworks", "static")
+
+# deferred text cleaning config
+cleaner_deferred = CFG_DATA_APP.getboolean("Cleaner", "deferred")
+
+# CSV engine config to load the gallery
+loader_engine = CFG_DATA_APP.get("Loader", "engine")
+
+# binary columnar storage config of the gallery
+storage_fmt = CFG_DATA_APP.get("Storage", "format")
+storage_incr = CFG_DATA_APP.getboolean("Storage", "incremental")
+
+# SQLite store config of the letters and artworks
+database_on = CFG_DATA_APP.getboolean("Database", "enabled")
+databasefn = CFG_DATA_APP.get("Database", "databaseFile")
+
+# resumable journal of the scrapping tasks config
+journal_on = CFG_DATA_APP.getboolean("Journal", "enabled")
+journalfn = CFG_DATA_APP.get("Journal", "journalFile")
+
 # cresting the export file for the data
 bfn = CFG_DATA_APP.get("ExportFiles", "basicfile")
 fext = CFG_DATA_APP.get("ExportFiles", "fext")
@@ -151,6 +235,9 @@ class View():
     # ====================================================
     gallery_controller = Controller()
     gallery_model = Gallery()
+    http_pool = None
+    browser = None
+    database = None
     localg_path = str()
     imgd_path = str()
     webg_path = str()
@@ -229,9 +316,9 @@ class View():
             # create a new index based in the root url
             print("1) Scrap the letters ids from the VVG Gallery and their URLs")
             # save in files all the scrapped data
-            print("2) Save Gallery data (saving into *.CSV)")
+            print("2) Save Gallery data (saving into the columnar store or *.CSV)")
             # load preavious scraped data into model
-            print("3) Load Gallery data (loading from *.CSV)")
+            print("3) Load Gallery data (loading from the columnar store or *.CSV)")
             # load preavious scraped data into model
             print("4) Check Gallery data (reading current *.CSV)")
             # recovers the basic data from the gallery query
@@ -244,7 +331,11 @@ class View():
             print("9) Get Gallery elements artworks (ARTWORKSTITLE, ARTWORKSF, ARTWORKSJH, ARTWORKSLINK, ARTWORKSID)")
             print("10) Download Gallery elements artworks images")
             print("11) Export DataFrame to JSON Files (from CSV to Local dir)")
-            print("99) Auto script for options (3, 4, 5, 6, 7, 8, 9, 10, 11)")
+            print("12) Get Gallery elements metadata and texts in one pass (options 5, 6, 7, 8)")
+            print("13) Crawl Gallery elements metadata and texts concurrently (options 5, 6, 7, 8)")
+            print("14) Refresh the letters ids against the loaded CSV (only new and removed letters)")
+            print("15) Export Gallery data into *.CSV")
+            print("99) Auto script for options (3, 4, 5, 6, 7, 8, 9, 10, 11, 15)")
             print("0) EXIT (last option)")
             # finish program
 
@@ -278,13 +369,88 @@ class View():
             print("View gallery Web URL: " + str(self.webg_path))
             print("\n")
 
+            # creating the response cache in the local gallery path
+            hc = None
+            if cache_on:
+                hcp = self.gallery_controller.setup_local(gf, cachef)
+                hc = Cache(hcp, max_age=cache_age)
+
+            # creating the rate limiter pacing the requests of each host
+            hl = Limiter(rate=limiter_rate,
+                         min_rate=limiter_min,
+                         max_rate=limiter_max,
+                         burst=limiter_burst,
+                         slow_latency=limiter_slow)
+
+            # creating the HTTP connection pool shared by model and controller
+            self.http_pool = Pool(connections=pool_conn,
+                                  maxsize=pool_size,
+                                  block=pool_block,
+                                  retries=pool_retries,
+                                  timeout=pool_timeout,
+                                  cache=hc,
+                                  limiter=hl)
+            hp = self.http_pool
+            ge = Engine(pool=hp,
+                        concurrency=engine_conc,
+                        host_limit=engine_hlimit,
+                        host_delay=engine_hdelay)
+
+            # creating the image store in the local gallery path
+            gs = None
+            if dl_dedup:
+                gsp = self.gallery_controller.setup_local(gf, storef)
+                gs = Store(gsp)
+
+            gd = Downloader(pool=hp,
+                            workers=dl_workers,
+                            host_limit=dl_hlimit,
+                            chunk_size=dl_chunk,
+                            verify=dl_verify,
+                            store=gs)
+
+            # creating the headless browser pool for the artworks
+            self.browser = Browser(size=browser_size,
+                                   headless=browser_headless,
+                                   max_uses=browser_uses,
+                                   load_timeout=browser_timeout)
+            gb = self.browser
+
+            # creating the binary columnar store of the gallery
+            gfr = Frames(storage_fmt)
+
+            # creating the SQLite store of the letters
+            if database_on:
+                dbp = self.gallery_controller.setup_local(gf, sf)
+                artworks_cols = [artworks_title_col, artworks_f_col,
+                                 artworks_jh_col, artworks_link_col,
+                                 artworks_id_col]
+                self.database = Database(os.path.join(dbp, databasefn),
+                                         columns=VVG_DF_COLS,
+                                         key=id_col,
+                                         artworks=artworks_cols,
+                                         artwork_key=artworks_id_col)
+
             # creating the gallery model
             wg = self.webg_path
             gp = self.localg_path
             ip = self.imgd_path
             vdfc = VVG_DF_COLS
 
-            self.gallery_model = Gallery(wg, gp, ip, schema=vdfc)
+            self.gallery_model = Gallery(wg, gp, ip,
+                                         schema=vdfc,
+                                         pool=hp,
+                                         engine=ge,
+                                         downloader=gd,
+                                         browser=gb,
+                                         static=artworks_static,
+                                         dialect=parser_dialect,
+                                         strain=parser_strain,
+                                         deferred=cleaner_deferred,
+                                         reader=loader_engine,
+                                         frames=gfr,
+                                         incremental=storage_incr,
+                                         database=self.database)
             print("============== Creating Gallery Model ==============")
             print("Model gallery localpath: " +
                   str(self.gallery_model.localg_path))
@@ -296,10 +462,18 @@ class View():
 
             gm = self.gallery_model
 
+            # creating the journal of the scrapping tasks
+            gj = Journal()
+            if journal_on:
+                jp = self.gallery_controller.setup_local(gf, sf)
+                gj = Journal(os.path.join(jp, journalfn))
+
             # creating the gallery controller
             self.gallery_controller = Controller(wg, gp, ip,
                                                  model=gm,
-                                                 schema=vdfc)
+                                                 schema=vdfc,
+                                                 pool=hp,
+                                                 journal=gj)
             print("============ Crating Gallery Controller ============")
             print("Controller gallery localpath: " +
                   str(self.gallery_controller.localg_path))
@@ -346,8 +520,8 @@ class View():
 
     def two(self, *args):
         """
-        Option 2, saves the in-memory data into CSV and creates the
-        local dirpath for the files if it doesnt exists
+        Option 2, saves the in-memory data into the binary columnar store,
+        or into CSV if the storage format is csv
 
         Args:
             expf (str): export file name, Default CSV
@@ -360,9 +534,13 @@ class View():
             ans (bool): boolean to confirm success of the task
         """
         try:
-            print("Saving gallery Model into CSV file...")
             gc = self.gallery_controller
-            ans = gc.save_gallery(args[0], args[1])
+            if storage_fmt == "csv":
+                print("Saving gallery Model into CSV file...")
+                ans = gc.save_gallery(args[0], args[1])
+            else:
+                print("Saving gallery Model into the columnar store...")
+                ans = gc.save_frames(args[0], args[1])
             return ans
 
         # exception handling
@@ -371,8 +549,9 @@ class View():
 
     def three(self, *args):
         """
-        Option 3, loads the in memory of the CSV data and creates the
-        local dirpath for the files if it doesnt exists
+        Option 3, loads the in memory of the columnar store data, or the
+        CSV data if the store does not exist or the CSV file is newer, and
+        creates the local dirpath for the files if it doesnt exists
 
         Args:
             id_col (str): df-schema column name of the ID
@@ -386,11 +565,17 @@ class View():
             ans (bool): boolean to confirm success of the task
         """
         try:
-            print("Loading Gallery CSV file into Model...")
-
             gc = self.gallery_controller
             gp = self.localg_path
-            ans = gc.load_gallery(args[0], args[1])
+            ans = False
+            if storage_fmt != "csv":
+                print("Loading Gallery columnar store into Model...")
+                ans = gc.load_frames(args[0], args[1])
+
+            if not ans:
+                print("Loading Gallery CSV file into Model...")
+                ans = gc.load_gallery(args[0], args[1])
+            gc.sync_database()
             gc.create_localfolders(gp, args[2])
             return ans
 
@@ -460,7 +645,7 @@ class View():
         try:
             print("Recovering elements original text (ORIGINAL)")
             gc = self.gallery_controller
-            original_texts = gc.scrap_original_texts(args[0], args[1])
+            original_texts = gc.scrap_original_texts(*args)
             ans = gc.updata(args[2], original_texts)
             return ans
 
@@ -483,7 +668,7 @@ class View():
         try:
             print("Recovering elements translation text (TRANSLATION)")
             gc = self.gallery_controller
-            translation_texts = gc.scrap_translation_texts(args[0], args[1])
+            translation_texts = gc.scrap_translation_texts(*args)
             ans = gc.updata(args[2], translation_texts)
             return ans
         except Exception as exp:
@@ -505,7 +690,7 @@ class View():
         try:
             print("Recovering elements notes text (NOTES)")
             gc = self.gallery_controller
-            notes_texts = gc.scrap_notes_texts(args[0], args[1])
+            notes_texts = gc.scrap_notes_texts(*args)
             ans = gc.updata(args[2], notes_texts)
             return ans
         except Exception as exp:
@@ -591,6 +776,116 @@ class View():
         except Exception as exp:
             raise exp
 
+    def twelve(self, *args):
+        """
+        Option 12, based on the results of option 1, it scrap the metadata,
+        original text, translation text and notes of all the letters in the
+        VVG letters page requesting each letter only once.
+
+        Args:
+            vvg_url (str): web gallery URL search for the collection
+            id_col (str): df-schema column name of the ID
+            letter_cols (list): list with the df-schema column names of TITLE,
+            AUTHOR, ADDRESSEE, DATE, LOCATION, ORIGINAL, TRANSLATION, NOTES
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): boolean to confirm success of the task
+        """
+        try:
+            print("Recovering elements metadata and texts (TITLE, AUTHOR, ADDRESSEE, DATE, LOCATION, ORIGINAL, TRANSLATION, NOTES)")
+            gc = self.gallery_controller
+            letters = gc.scrap_letters(*args)
+            ans = True
+            for col in args[2]:
+                ans = ans and gc.updata(col, letters[col])
+            return ans
+        except Exception as exp:
+            raise exp
+
+    def thirteen(self, *args):
+        """
+        Option 13, same as option 12 but requesting many letters at the
+        same time with the concurrent fetch engine.
+
+        Args:
+            vvg_url (str): web gallery URL search for the collection
+            id_col (str): df-schema column name of the ID
+            letter_cols (list): list with the df-schema column names of TITLE,
+            AUTHOR, ADDRESSEE, DATE, LOCATION, ORIGINAL, TRANSLATION, NOTES
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): boolean to confirm success of the task
+        """
+        try:
+            print("Crawling elements metadata and texts (TITLE, AUTHOR, ADDRESSEE, DATE, LOCATION, ORIGINAL, TRANSLATION, NOTES)")
+            gc = self.gallery_controller
+            letters = gc.crawl_letters(*args)
+            ans = True
+            for col in args[2]:
+                ans = ans and gc.updata(col, letters[col])
+            return ans
+        except Exception as exp:
+            raise exp
+
+    def fourteen(self, *args):
+        """
+        Option 14, based on the results of option 3, it scrap the links/routes
+        of the letters again and only adds the new letters and removes the
+        missing ones, the rest of the letters keep their data.
+
+        Args:
+            vvg_url (str): web gallery URL search for the collection
+            id_col (str): df-schema column name of the ID
+            url_col (str): df-schema column name of the URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): boolean to confirm success of the task
+        """
+        try:
+            print("Refreshing Gallery IDs (ID, URL) against the loaded CSV")
+            gc = self.gallery_controller
+            added, removed = gc.refresh_routes(*args)
+            print("New Gallery IDs: " + str(len(added)))
+            print("Removed Gallery IDs: " + str(len(removed)))
+            ans = True
+            return ans
+        except Exception as exp:
+            raise exp
+
+    def fifteen(self, *args):
+        """
+        Option 15, exports the in-memory data into CSV, the final step
+        after saving the options in the columnar store
+
+        Args:
+            expf (str): export file name, Default CSV
+            dataf (str): data folder name for the app
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): boolean to confirm success of the task
+        """
+        try:
+            print("Exporting gallery Model into CSV file...")
+            gc = self.gallery_controller
+            ans = gc.save_gallery(args[0], args[1])
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            raise exp
+
     def printre(self, report):
         """
         prints the report tittle in the console
@@ -674,10 +969,32 @@ class View():
                     self.eleven(id_col, json_index_cols)
                     ans = True
 
+                # recovering letter metadata and texts in one pass
+                elif int(inp) == 12:
+                    letter_cols = [title_col, author_col, addressee_col,
+                                   date_col, location_col, original_col,
+                                   translation_col, notes_col]
+                    ans = self.twelve(vvg_url, id_col, letter_cols)
+
+                # crawling letter metadata and texts concurrently
+                elif int(inp) == 13:
+                    letter_cols = [title_col, author_col, addressee_col,
+                                   date_col, location_col, original_col,
+                                   translation_col, notes_col]
+                    ans = self.thirteen(vvg_url, id_col, letter_cols)
+
+                # refreshing the letters index with only the changes
+                elif int(inp) == 14:
+                    ans = self.fourteen(vvg_url, id_col, url_col)
+
+                # exporting gallery in CSV file
+                elif int(inp) == 15:
+                    ans = self.fifteen(expf, dataf)
+
                 elif int(inp) == 99:
                     # list of automatic steps
-                    # (3, 4, 2, 5, 2, 6, 2, 7, 2, 8, 2, 9, 2, 10, 11, 2)
-                    print("Auto executing options 3 to 11!!!...")
+                    # (3, 4, 2, 5, 2, 6, 2, 7, 2, 8, 2, 9, 2, 10, 11, 2, 15)
+                    print("Auto executing options 3 to 15!!!...")
                     ans = True
                     ans = ans and self.three(expf, dataf, id_col)
 
@@ -705,11 +1022,16 @@ class View():
 
                     self.eleven(id_col, json_index_cols)
                     ans = self.two(expf, dataf)
+                    ans = ans and self.fifteen(expf, dataf)
 
                     self.inputs = -1
 
                 # exit program
                 elif int(inp) == 0:
+                    self.http_pool.close()
+                    self.browser.close()
+                    if self.database is not None:
+                        self.database.close()
                     sys.exit(0)
 
                 # other option selected
@@ -0,0 +1,260 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import atexit
+import queue
+import threading
+
+# =========================================
+# Third party imports
+# =========================================
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# max number of browsers open at the same time
+DEFAULT_POOL_SIZE = 2
+# run the browsers without a window
+DEFAULT_HEADLESS = True
+# pages a browser loads before it is recycled
+DEFAULT_MAX_USES = 100
+# seconds to wait for a page to load
+DEFAULT_LOAD_TIMEOUT = 60
+
+
+class Browser():
+    """
+    this module keeps a pool of long-lived selenium browsers reused across
+    the letters, the browsers are created on demand, recycled when they
+    fail or get old and closed when the program ends
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    size = DEFAULT_POOL_SIZE
+    headless = DEFAULT_HEADLESS
+    max_uses = DEFAULT_MAX_USES
+    load_timeout = DEFAULT_LOAD_TIMEOUT
+    count = 0
+    idle = None
+    uses = None
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Browser()
+
+        Args:
+            size (int, optional): max browsers open at the same time.
+            Default is 2
+            headless (bool, optional): run the browsers without a window.
+            Default is True
+            max_uses (int, optional): pages a browser loads before it is
+            recycled. Default is 100
+            load_timeout (int, optional): seconds to wait for a page to load.
+            Default is 60
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.size = kwargs.get("size", DEFAULT_POOL_SIZE)
+            self.headless = kwargs.get("headless", DEFAULT_HEADLESS)
+            self.max_uses = kwargs.get("max_uses", DEFAULT_MAX_USES)
+            self.load_timeout = kwargs.get("load_timeout",
+                                           DEFAULT_LOAD_TIMEOUT)
+            self.count = 0
+            self.idle = queue.Queue()
+            self.uses = dict()
+            self.lock = threading.Lock()
+
+            # closing the browsers even if the program crashes
+            atexit.register(self.close)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Browser: __init__")
+
+    def create(self):
+        """
+        Start a new firefox browser with the pool options
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (webdriver): new selenium firefox driver
+        """
+        try:
+            options = Options()
+            if self.headless:
+                options.add_argument("-headless")
+            options.add_argument("--width=1920")
+            options.add_argument("--height=1080")
+
+            ans = webdriver.Firefox(options=options)
+            ans.set_page_load_timeout(self.load_timeout)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Browser: create")
+
+    def acquire(self):
+        """
+        Take a healthy browser from the pool, a new one is started if the
+        pool is not full, otherwise it waits for a browser to be released
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (webdriver): selenium driver ready to use
+        """
+        try:
+            ans = None
+
+            while ans is None:
+                try:
+                    ans = self.idle.get_nowait()
+
+                except queue.Empty:
+                    # reserving a place for a new browser
+                    with self.lock:
+                        grow = self.count < self.size
+                        if grow:
+                            self.count += 1
+
+                    if grow:
+                        try:
+                            ans = self.create()
+                        except Exception:
+                            with self.lock:
+                                self.count -= 1
+                            raise
+                        with self.lock:
+                            self.uses[id(ans)] = 0
+
+                    # the pool is full, waiting for a released browser
+                    # and checking again if a discarded one left room
+                    else:
+                        try:
+                            ans = self.idle.get(timeout=1.0)
+                        except queue.Empty:
+                            ans = None
+
+                # recycling browsers that died while idle
+                if ans is not None and not self.check(ans):
+                    self.discard(ans)
+                    ans = None
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Browser: acquire")
+
+    def release(self, driver, healthy=True):
+        """
+        Give a browser back to the pool, unhealthy or old browsers are
+        closed and replaced on demand
+
+        Args:
+            driver (webdriver): selenium driver taken with acquire()
+            healthy (bool, optional): False if the browser failed while
+            using it. Default is True
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+                old = self.uses[id(driver)] >= self.max_uses
+
+            if healthy and not old:
+                self.idle.put(driver)
+            else:
+                self.discard(driver)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Browser: release")
+
+    def check(self, driver):
+        """
+        Check if a browser still answers to the selenium commands
+
+        Args:
+            driver (webdriver): selenium driver to check
+
+        Returns:
+            ans (bool): True if the browser is alive, False otherwise
+        """
+        ans = True
+        try:
+            driver.current_url
+        except Exception:
+            ans = False
+        return ans
+
+    def discard(self, driver):
+        """
+        Close a browser and remove it from the pool
+
+        Args:
+            driver (webdriver): selenium driver to close
+        """
+        with self.lock:
+            if self.uses.pop(id(driver), None) is not None:
+                self.count -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """
+        Close all the idle browsers in the pool
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            while not self.idle.empty():
+                self.discard(self.idle.get_nowait())
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Browser: close")
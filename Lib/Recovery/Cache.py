@@ -0,0 +1,316 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+# =========================================
+# Third party imports
+# =========================================
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# seconds a cached response is served without asking the server
+DEFAULT_MAX_AGE = 86400.0
+
+
+class Cache():
+    """
+    this module keeps a persistent cache of the HTTP responses in a local
+    folder, keyed by URL, with the body and the ETag/Last-Modified headers
+    needed to revalidate them with the server
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    path = str()
+    max_age = DEFAULT_MAX_AGE
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Cache()
+
+        Args:
+            path (str): local dirpath to save the cached responses
+            max_age (float, optional): seconds a cached response is served
+            without revalidation. Default is 86400.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.path = str()
+            self.max_age = kwargs.get("max_age", DEFAULT_MAX_AGE)
+
+            # local dirpath of the cache
+            if len(args) > 0:
+                self.path = args[0]
+
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: __init__")
+
+    def locate(self, url):
+        """
+        Get the local filepaths of the cached body and metadata of an URL
+
+        Args:
+            url (str): URL of the cached response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (tuple): body filepath and metadata filepath
+        """
+        try:
+            key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+            body = os.path.join(self.path, key + ".body")
+            meta = os.path.join(self.path, key + ".json")
+            ans = (body, meta)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: locate")
+
+    def load(self, url):
+        """
+        Load the cached entry of an URL
+
+        Args:
+            url (str): URL of the cached response
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): metadata of the entry with its "body" in bytes, None
+            if the URL is not cached
+        """
+        try:
+            ans = None
+            bfp, mfp = self.locate(url)
+
+            if os.path.exists(bfp) and os.path.exists(mfp):
+                with open(mfp, "r", encoding="utf-8") as file:
+                    meta = json.load(file)
+                with open(bfp, "rb") as file:
+                    body = file.read()
+
+                # a half written entry is a cache miss
+                if len(body) == meta.get("length"):
+                    meta["body"] = body
+                    ans = meta
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: load")
+
+    def store(self, url, response):
+        """
+        Save a successful response of an URL in the cache
+
+        Args:
+            url (str): URL of the response
+            response (requests.Response): response to cache
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): metadata of the new entry with its "body" in bytes
+        """
+        try:
+            bfp, mfp = self.locate(url)
+            body = response.content
+            meta = {
+                "url": url,
+                "status": response.status_code,
+                "encoding": response.encoding,
+                "headers": dict(response.headers),
+                "etag": response.headers.get("ETag"),
+                "modified": response.headers.get("Last-Modified"),
+                "length": len(body),
+                "time": time.time(),
+            }
+
+            # body first, the metadata validates it when loading
+            self.write(bfp, body)
+            self.write(mfp, json.dumps(meta).encode("utf-8"))
+
+            ans = dict(meta)
+            ans["body"] = body
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: store")
+
+    def refresh(self, url, entry, response):
+        """
+        Mark a cached entry as revalidated after a 304 Not Modified answer
+
+        Args:
+            url (str): URL of the cached response
+            entry (dict): cached entry, see load()
+            response (requests.Response): 304 response of the server
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): updated entry
+        """
+        try:
+            bfp, mfp = self.locate(url)
+            entry["time"] = time.time()
+            etag = response.headers.get("ETag")
+            if etag is not None:
+                entry["etag"] = etag
+
+            meta = dict(entry)
+            meta.pop("body")
+            self.write(mfp, json.dumps(meta).encode("utf-8"))
+
+            ans = entry
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: refresh")
+
+    def fresh(self, entry):
+        """
+        Check if a cached entry can be served without asking the server
+
+        Args:
+            entry (dict): cached entry, see load()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the entry is younger than max_age
+        """
+        try:
+            ans = (time.time() - entry.get("time", 0.0)) < self.max_age
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: fresh")
+
+    def validators(self, entry):
+        """
+        Build the conditional request headers to revalidate a cached entry
+
+        Args:
+            entry (dict): cached entry, see load()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): If-None-Match/If-Modified-Since headers
+        """
+        try:
+            ans = dict()
+            if entry.get("etag"):
+                ans["If-None-Match"] = entry.get("etag")
+            if entry.get("modified"):
+                ans["If-Modified-Since"] = entry.get("modified")
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: validators")
+
+    def respond(self, entry):
+        """
+        Rebuild a requests.Response from a cached entry
+
+        Args:
+            entry (dict): cached entry, see load()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): response served from the local cache
+        """
+        try:
+            ans = requests.models.Response()
+            ans.url = entry.get("url")
+            ans.status_code = entry.get("status")
+            ans.encoding = entry.get("encoding")
+            ans.headers = CaseInsensitiveDict(entry.get("headers"))
+            ans._content = entry.get("body")
+            ans._content_consumed = True
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: respond")
+
+    def write(self, fp, data):
+        """
+        Atomically write a cache file, a temporal file is renamed once it is
+        complete so a crash never leaves a truncated entry
+
+        Args:
+            fp (str): local filepath to write
+            data (bytes): data to write
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            fd, tfp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tfp, fp)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Cache: write")
@@ -21,7 +21,8 @@
 # =========================================
 # native python libraries
 # =========================================
-# import re
+import re
+import unicodedata
 # import os
 # import copy
 # import urllib
@@ -31,21 +32,34 @@
 # extension python libraries
 # =========================================
 # from urllib.parse import urlparse
-# import unicodedata
+import pandas as pd
 
 # =========================================
 # developed python libraries
 # =========================================
 import Conf
 from Lib.Utils import Err
+from Lib.Recovery.Parser import Parser
 assert Conf
 assert Err
+assert Parser
 
 # =========================================
 # Global variables
 # =========================================
 DEFAULT_HTML_PARSER = "html.parser"
 
+# compiled rules of clrtext(), applied in this order
+# a space followed by more blanks
+SPACES_REGEX = re.compile(r" \s+")
+# HTML weird leftovers
+NONE_REGEX = re.compile(r"None{1,3}")
+# removed punctuations
+PUNCTUATION_TABLE = str.maketrans({";": None, ",": None})
+# separator of the texts in clrcolumn(), it is not a blank, ascii letter or
+# punctuation so no rule can match across two texts
+COLUMN_SEPARATOR = "\x00"
+
 
 class Topic():
     """
@@ -61,6 +75,7 @@ class Topic():
     sbody = None
     shead = None
     dialect = DEFAULT_HTML_PARSER
+    parser = None
 
     def __init__(self, *args, **kwargs):
         """
@@ -68,8 +83,8 @@ class Topic():
 
         Args:
             url (str): page url to recover. Defaults is empty str
-            dialect (str): beautifulSoup parser dialect. Defaults
-            "html.parser"
+            dialect (str): beautifulSoup parser dialect, ie.: lxml, uses
+            "html.parser" if it is not installed. Defaults "html.parser"
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -103,6 +118,140 @@ class Topic():
                     if key == "dialect":
                         self.dialect = kwargs.get("dialect")
 
+            # parser backend for the dialect
+            self.parser = Parser(self.dialect)
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Topic: XXXXX")
+
+    def clrtext(self, text):
+        """
+        clean text from HTML, remove all inconvinient characters such as:
+        extra spaces, extra end-of-line, and non utf-8 characters
+
+        Args:
+            text (str): text to clean
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans(str): clean text
+        """
+        try:
+            # asigning text as ans and attempt striping
+            ans = str(text).strip()
+
+            # fix encoding, only needed out of the ascii range
+            if not ans.isascii():
+                ans = unicodedata.normalize("NFD", ans)
+                ans = ans.encode("ascii", "ignore").decode("utf-8")
+
+            # removing extra spaces, newlines and pesky single quotes, the
+            # text is ascii at this point so there is no ’ left
+            ans = SPACES_REGEX.sub(" ", ans)
+            ans = ans.replace("\n", ". ").replace("\r", ". ")
+            ans = ans.replace("'", "")
+
+            # HTML weird leftovers
+            if "None" in ans:
+                ans = NONE_REGEX.sub(" ", ans)
+
+            # remove some punctuations and rechecking the spaces
+            ans = ans.translate(PUNCTUATION_TABLE)
+            ans = SPACES_REGEX.sub(" ", ans)
+
+            # return answer
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: clrtext")
+
+    def clrtexts(self, texts):
+        """
+        clean a whole list or pandas Series of texts with the clrtext() rules
+
+        Args:
+            texts (list/Series): texts to clean
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans(list/Series): clean texts, same type of the input
+        """
+        try:
+            clean = self.clrtext
+            ans = [clean(text) for text in texts]
+
+            # keeping the index and name of a pandas Series
+            if isinstance(texts, pd.Series):
+                ans = pd.Series(ans, index=texts.index, name=texts.name)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: clrtexts")
+
+    def clrcolumn(self, texts):
+        """
+        clean a whole column of texts at once with the clrtext() rules, the
+        texts are joined in a single buffer with a separator no rule can
+        touch so every rule runs once over the column instead of once for
+        each text
+
+        Args:
+            texts (list/Series): texts to clean
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans(list/Series): clean texts, same type of the input
+        """
+        try:
+            # same str() cast and strip of clrtext(), ie.: None is "None"
+            column = list(map(str.strip, map(str, texts)))
+            ans = list()
+
+            if len(column) > 0:
+                buffer = COLUMN_SEPARATOR.join(column)
+
+                # a text with the separator can not be split back
+                if buffer.count(COLUMN_SEPARATOR) != len(column) - 1:
+                    ans = self.clrtexts(column)
+
+                else:
+                    # fix encoding, only needed out of the ascii range
+                    ans = buffer
+                    if not ans.isascii():
+                        ans = unicodedata.normalize("NFD", ans)
+                        ans = ans.encode("ascii", "ignore").decode("utf-8")
+
+                    # removing extra spaces, newlines and pesky single quotes
+                    ans = SPACES_REGEX.sub(" ", ans)
+                    ans = ans.replace("\n", ". ").replace("\r", ". ")
+                    ans = ans.replace("'", "")
+
+                    # HTML weird leftovers
+                    if "None" in ans:
+                        ans = NONE_REGEX.sub(" ", ans)
+
+                    # remove some punctuations and rechecking the spaces
+                    ans = ans.translate(PUNCTUATION_TABLE)
+                    ans = SPACES_REGEX.sub(" ", ans)
+                    ans = ans.split(COLUMN_SEPARATOR)
+
+            # keeping the index and name of a pandas Series
+            if isinstance(texts, pd.Series):
+                ans = pd.Series(ans, index=texts.index, name=texts.name,
+                                dtype=object)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Topic: clrcolumn")
@@ -20,29 +20,69 @@
 # =========================================
 # Standard library imports
 # =========================================
-import time
 import re
+import urllib.parse
 
 # =========================================
 # Third party imports
 # =========================================
-import requests
-from selenium import webdriver
-from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
 
 # =========================================
 # Local application imports
 # =========================================
 import Conf
 from Lib.Utils import Err
+from Lib.Recovery.Pool import Pool
+from Lib.Recovery.Browser import Browser
+from Lib.Recovery.Parser import Parser
 assert Conf
 assert Err
+assert Pool
+assert Browser
+assert Parser
 
 # =========================================
 # Global variables
 # =========================================
 DEFAULT_HTML_PARSER = "html.parser"
 
+# parse only the subtrees of the searched tags
+DEFAULT_STRAIN = False
+
+# keep-alive connection pool shared by all the pages without a custom one
+DEFAULT_POOL = Pool()
+
+# headless browser pool shared by all the pages without a custom one
+DEFAULT_BROWSER = Browser()
+
+# seconds without DOM mutations after which the new items are loaded
+DEFAULT_SCROLL_SETTLE = 0.25
+# max seconds of a scroll step when the page never stops changing
+DEFAULT_SCROLL_STEP = 10
+
+# scrolls to the bottom of the page and calls back with the new height
+# when the mutations settle, or when nothing changes after the wait time
+SCROLL_SCRIPT = """
+var wait = arguments[0], settle = arguments[1], step = arguments[2];
+var done = arguments[arguments.length - 1];
+var timer = null, limit = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(timer);
+    timer = setTimeout(finish, settle);
+});
+function finish() {
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(limit);
+    done(document.body.scrollHeight);
+}
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+timer = setTimeout(finish, wait);
+limit = setTimeout(finish, Math.max(wait, step));
+"""
+
 
 class Page():
     """
@@ -59,6 +99,10 @@ class Page():
     shead = None
     content = None
     dialect = DEFAULT_HTML_PARSER
+    parser = None
+    strain = DEFAULT_STRAIN
+    pool = DEFAULT_POOL
+    browser = DEFAULT_BROWSER
 
     def __init__(self, *args, **kwargs):
         """
@@ -66,8 +110,14 @@ class Page():
 
         Args:
             url (str, optional): page url to recover. Defaults is empty str
-            dialect (str, optional): beautifulSoup parser dialect. Defaults
-            "html.parser"
+            dialect (str, optional): beautifulSoup parser dialect, ie.: lxml,
+            uses "html.parser" if it is not installed. Defaults "html.parser"
+            strain (bool, optional): parse only the subtrees of the searched
+            tag and attributes. Defaults False
+            pool (Pool, optional): shared HTTP connection pool. Defaults
+            to the module DEFAULT_POOL
+            browser (Browser, optional): shared headless browser pool.
+            Defaults to the module DEFAULT_BROWSER
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -77,6 +127,9 @@ class Page():
             # default object attributes
             self.url = str()
             self.dialect = DEFAULT_HTML_PARSER
+            self.strain = DEFAULT_STRAIN
+            self.pool = DEFAULT_POOL
+            self.browser = DEFAULT_BROWSER
             self.request = None
             self.sbody = None
             self.shead = None
@@ -101,12 +154,71 @@ class Page():
                     if key == "dialect":
                         self.dialect = kwargs.get("dialect")
 
+                    # partial parsing of the pages
+                    if key == "strain":
+                        self.strain = kwargs.get("strain")
+
+                    # sharing the HTTP connection pool
+                    if key == "pool" and kwargs.get("pool") is not None:
+                        self.pool = kwargs.get("pool")
+
+                    # sharing the headless browser pool
+                    if key == "browser" and kwargs.get("browser") is not None:
+                        self.browser = kwargs.get("browser")
+
+            # parser backend for the dialect
+            self.parser = Parser(self.dialect)
+
         # exception handling
         except Exception as exp:
             Err.reraise(exp, "Page: __init__")
 
 # ============================================================================================================
 
+    def soup(self, markup, tag=None, attrs=None):
+        """
+        Parse an HTML document, in strain mode only the subtrees of the
+        given tag and attributes are parsed
+
+        Args:
+            markup (str/bytes): HTML document to parse
+            tag (str, optional): tag of the subtrees to keep. Default is None
+            attrs (dict, optional): attributes that must have the tag.
+            Default is None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (BeautifulSoup): parsed document
+        """
+        try:
+            only = None
+            if self.strain and tag is not None:
+                only = self.parser.strainer(tag, attrs)
+            ans = self.parser.parse(markup, parse_only=only)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: soup")
+
+    def pace(self, url):
+        """
+        Wait for the rate limiter of the HTTP pool before a browser loads
+        an URL, the browsers do not send their requests through the pool
+
+        Args:
+            url (str): URL the browser is going to load
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            limiter = getattr(self.pool, "limiter", None)
+            if limiter is not None:
+                limiter.acquire(url)
+        except Exception as exp:
+            Err.reraise(exp, "Page: pace")
+
     def get_image(self, url):
         """
         Get the image from an artwork.
@@ -121,18 +233,22 @@ class Page():
             ans (bytes): image
         """
         try:
-            response = requests.get(url)
+            response = self.pool.get(url)
             ans = response.content
             return ans
         except Exception as exp:
             Err.reraise(exp, "Page: get_image")
 
-    def load_body(self, return_data=False):
+    def load_body(self, return_data=False, tag=None, attrs=None):
         """
         Load the body of the url. 
 
         Args:
             return_data (bool): Defines if return data or not. Default to False
+            tag (str, optional): tag searched in the body, in strain mode
+            only its subtrees are parsed. Default to None
+            attrs (dict, optional): attributes that must have the tag.
+            Default to None
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -142,8 +258,8 @@ class Page():
         """
         try:
             ans = None
-            response = requests.get(self.url)
-            self.sbody = BeautifulSoup(response.text, "html.parser")
+            response = self.pool.get(self.url)
+            self.sbody = self.soup(response.text, tag=tag, attrs=attrs)
             if return_data:
                 ans = self.sbody
                 return ans
@@ -181,26 +297,87 @@ class Page():
         except Exception as exp:
             Err.reraise(exp, "Page: get_elements")
 
-    def scrap_metadata(self, route, tag="div", attrs={}):
+    def letter_path(self, route, page="print.html"):
         """
-        Get the metadata of a given letter (route).
+        Build the URL of a given letter (route) page.
 
         Args:
             route (str): letter ID
+            page (str, optional): letter page to request. Default is print.html
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): URL of the letter page
+        """
+        try:
+            ans = self.url.replace(".html", "/"+route+"/"+page)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: letter_path")
+
+    def get_letter(self, route, tag="div", attrs={}):
+        """
+        Request and parse the print page of a given letter (route) only once,
+        returning all the elements of the given tag.
+
+        Args:
+            route (str): letter ID
+            tag (str, optional): tag that contains all the data. Default is div
+            attrs (dict, optional): attributes that must have the tag. Default is empty
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): List with all the elements of the letter
+        """
+        try:
+            path = self.letter_path(route)
+            response = self.pool.get(path)
+            ans = self.find_letter(response.text, tag=tag, attrs=attrs)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: get_letter")
+
+    def find_letter(self, markup, tag="div", attrs={}):
+        """
+        Parse the already downloaded print page of a letter, returning all
+        the elements of the given tag.
+
+        Args:
+            markup (str): HTML text of the letter print page
             tag (str, optional): tag that contains all the data. Default is div
             attrs (dict, optional): attributes that must have the tag. Default is empty
 
         Raises:
             exp: raise a generic exception if something goes wrong
 
+        Returns:
+            ans (list): List with all the elements of the letter
+        """
+        try:
+            body = self.soup(markup, tag=tag, attrs=attrs)
+            ans = body.find_all(tag, attrs=attrs)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: find_letter")
+
+    def parse_metadata(self, elements):
+        """
+        Get the metadata of a letter from its already parsed elements.
+
+        Args:
+            elements (list): elements of the letter, see get_letter()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
         Returns:
             ans (dict): Dictionary with the metadata
         """
         try:
-            path = self.url.replace(".html", "/"+route+"/print.html")
-            response = requests.get(path)
-            body = BeautifulSoup(response.text, "html.parser")
-            elements = body.find_all(tag, attrs=attrs)
             heading = elements[1].text.split("\n")
             title = heading[0]
             author = heading[1].split(": ")[1]
@@ -215,6 +392,51 @@ class Page():
                    "ADDRESSEE": to, "DATE": date,
                    "LOCATION": location}
             return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: parse_metadata")
+
+    def parse_at_position(self, elements, position=0):
+        """
+        Get the text of a letter at a specific position from its already
+        parsed elements.
+
+        Args:
+            elements (list): elements of the letter, see get_letter()
+            position (int, optional): position of the element to scrap. Default is 0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): Text of the element at the specific position
+        """
+        try:
+            ans = ""
+            if position < len(elements):
+                ans = elements[position].text.replace("\n", " ")
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: parse_at_position")
+
+    def scrap_metadata(self, route, tag="div", attrs={}):
+        """
+        Get the metadata of a given letter (route).
+
+        Args:
+            route (str): letter ID
+            tag (str, optional): tag that contains all the data. Default is div
+            attrs (dict, optional): attributes that must have the tag. Default is empty
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): Dictionary with the metadata
+        """
+        try:
+            elements = self.get_letter(route, tag=tag, attrs=attrs)
+            ans = self.parse_metadata(elements)
+            return ans
         except Exception as exp:
             Err.reraise(exp, "Page: scrap_metadata")
 
@@ -235,17 +457,68 @@ class Page():
             ans (str): Text of the element of the given tag at the specific position
         """
         try:
-            path = self.url.replace(".html", "/"+route+"/print.html")
-            response = requests.get(path)
-            body = BeautifulSoup(response.text, "html.parser")
-            elements = body.find_all(tag, attrs=attrs)
-            ans = ""
-            if position < len(elements):
-                ans = elements[position].text.replace("\n", " ")
+            elements = self.get_letter(route, tag=tag, attrs=attrs)
+            ans = self.parse_at_position(elements, position=position)
             return ans
         except Exception as exp:
             Err.reraise(exp, "Page: scrap_at_position")
 
+    def scrap_letter(self, route, tag="div", attrs={}, positions={}):
+        """
+        Get the metadata and the texts of a given letter (route) with a
+        single request and a single parse of its print page.
+
+        Args:
+            route (str): letter ID
+            tag (str, optional): tag that contains all the data. Default is div
+            attrs (dict, optional): attributes that must have the tag. Default is empty
+            positions (dict, optional): text names and their position in the
+            elements, ie.: {"ORIGINAL": 3}. Default is empty
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): Dictionary with the metadata and the texts
+        """
+        try:
+            path = self.letter_path(route)
+            response = self.pool.get(path)
+            ans = self.parse_letter(response.text,
+                                    tag=tag,
+                                    attrs=attrs,
+                                    positions=positions)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: scrap_letter")
+
+    def parse_letter(self, markup, tag="div", attrs={}, positions={}):
+        """
+        Get the metadata and the texts of an already downloaded letter
+        print page, ie.: a response from the concurrent Engine().
+
+        Args:
+            markup (str): HTML text of the letter print page
+            tag (str, optional): tag that contains all the data. Default is div
+            attrs (dict, optional): attributes that must have the tag. Default is empty
+            positions (dict, optional): text names and their position in the
+            elements, ie.: {"ORIGINAL": 3}. Default is empty
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): Dictionary with the metadata and the texts
+        """
+        try:
+            elements = self.find_letter(markup, tag=tag, attrs=attrs)
+            ans = self.parse_metadata(elements)
+            for key, position in positions.items():
+                ans[key] = self.parse_at_position(elements, position=position)
+            return ans
+        except Exception as exp:
+            Err.reraise(exp, "Page: parse_letter")
+
     def scrap_artworks(self, route):
         """
         Scrap all the artowrks of a given letter.
@@ -259,6 +532,112 @@ class Page():
         Returns:
             ans (dict): dict with all the data of the artworks of the given letter
         """
+        try:
+            path = self.letter_path(route, page="letter.html")
+
+            # reusing a headless browser from the pool
+            driver = self.browser.acquire()
+            healthy = False
+            try:
+                self.pace(path)
+                driver.get(path)
+                self.pace(path)
+                driver.refresh()
+                driver.find_element(By.LINK_TEXT, "works of art").click()
+                x = driver.find_elements(By.CLASS_NAME, "image")
+                pairs = []
+                for i in x:
+                    a = i.find_element(By.TAG_NAME, "a")
+                    img = a.find_element(By.TAG_NAME, "img")
+                    pairs.append((img.get_attribute("src"),
+                                  img.get_attribute("title")))
+                healthy = True
+            finally:
+                self.browser.release(driver, healthy=healthy)
+
+            ans = self.build_artworks(pairs)
+            return ans
+
+        except Exception as exp:
+            Err.reraise(exp, "Page: scrap_artworks")
+
+    def scrap_artworks_static(self, route):
+        """
+        Scrap all the artworks of a given letter from the static HTML of its
+        letter page, without a browser. Selenium is only used when the page
+        announces works of art that are not in its markup.
+
+        Args:
+            route (str): letter id to scrap artworks.
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): dict with all the data of the artworks of the given letter
+        """
+        try:
+            path = self.letter_path(route, page="letter.html")
+            response = self.pool.get(path)
+            ans = self.parse_artworks(response.text, path)
+
+            # falling back to the browser
+            if ans is None:
+                ans = self.scrap_artworks(route)
+            return ans
+
+        except Exception as exp:
+            Err.reraise(exp, "Page: scrap_artworks_static")
+
+    def parse_artworks(self, markup, path):
+        """
+        Get the artworks of an already downloaded letter page from the
+        <img> tags inside its <div class="image"><a> elements.
+
+        Args:
+            markup (str): HTML text of the letter page
+            path (str): URL of the letter page to complete relative links
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): dict with all the data of the artworks of the letter,
+            None if the artworks are only available with a browser
+        """
+        try:
+            ans = None
+            body = self.parser.parse(markup)
+
+            pairs = []
+            for img in body.select(".image a img"):
+                src = urllib.parse.urljoin(path, img.get("src", ""))
+                pairs.append((src, img.get("title", "")))
+
+            # artworks in the markup, or a letter without works of art
+            link = body.find("a", string=re.compile("works of art"))
+            if len(pairs) > 0 or link is None:
+                ans = self.build_artworks(pairs)
+
+            return ans
+
+        except Exception as exp:
+            Err.reraise(exp, "Page: parse_artworks")
+
+    def build_artworks(self, pairs):
+        """
+        Build the artworks data of a letter from the image links and titles,
+        the F and JH catalog numbers are taken from the titles.
+
+        Args:
+            pairs (list): list of (image src, image title) tuples
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): dict with all the data of the artworks of the letter
+        """
         try:
             links = []
             titles = []
@@ -266,19 +645,8 @@ class Page():
             JHs = []
             ids = []
 
-            path = self.url.replace(".html", "/"+route+"/letter.html")
-
-            driver = webdriver.Firefox()
-            driver.maximize_window()
-            driver.get(path)
-            driver.refresh()
-            driver.find_element_by_link_text("works of art").click()
-            x = driver.find_elements_by_class_name("image")
-            for i in x:
-                a = i.find_element_by_tag_name("a")
-                img = a.find_element_by_tag_name("img")
-                image_link = img.get_attribute("src").replace("t.jpg", ".jpg")
-                title = img.get_attribute('title')
+            for src, title in pairs:
+                image_link = src.replace("t.jpg", ".jpg")
                 F = re.findall(r'F\s\d+', title)
                 JH = re.findall(r'JH\s\d+', title)
                 if len(F) > 0:
@@ -298,47 +666,48 @@ class Page():
                 JHs.append(JH)
                 titles.append(title)
 
-            driver.close()
             ans = {"ARTWORKSTITLE": titles, "ARTWORKSF": Fs,
                    "ARTWORKSJH": JHs, "ARTWORKSLINK": links, "ARTWORKSID": ids}
             return ans
 
         except Exception as exp:
-            Err.reraise(exp, "Page: scrap_artworks")
+            Err.reraise(exp, "Page: build_artworks")
 
 # ============================================================================================================
 
     def get_collection(self, gurl, stime):
         """
         Gets an URL and a wait time to update the BeautifulSoup
-        object in the class attribute. 
+        object in the class attribute, the collection is loaded in a
+        headless browser reused from the pool, scrolled until no new items
+        appear and captured in a single round trip.
 
         Args:
             gurl (str): url of the main gallery to parse.
-            stime (float): waiting time between HTML request with selenium.
+            stime (float): max seconds to wait for new items after each
+            scroll of the collection.
 
         Raises:
             exp: raise a generic exception if something goes wrong
         """
         try:
-            # create the driver for the scrapping of the webpage
-            self.request = webdriver.Firefox()
-            self.request.implicitly_wait(30)
-            self.request.get(gurl)
-
-            # HTML from `<html>`
-            rbody = self.request.execute_script(
-                "return document.documentElement.innerHTML;")
-
-            # HTML from `<body>`
-            rbody = self.request.execute_script(
-                "return document.body.innerHTML;")
+            # reusing a headless browser from the pool
+            driver = self.browser.acquire()
+            healthy = False
+            try:
+                self.pace(gurl)
+                driver.get(gurl)
+                self.scroll_collection(driver, stime)
+
+                # HTML from `<body>`
+                rbody = driver.execute_script(
+                    "return document.body.innerHTML;")
+                healthy = True
+            finally:
+                self.browser.release(driver, healthy=healthy)
 
             # Once scroll returns bs4 parsers the page_source
-            self.sbody = BeautifulSoup(rbody, self.dialect)
-
-            # closing driver
-            self.request.close()
+            self.sbody = self.parser.parse(rbody)
 
         # exception handling
         except Exception as exp:
@@ -347,36 +716,35 @@ class Page():
     def scroll_collection(self, brdriver, stime):
         """
         private void function to scroll an infinte gallery of items in a web
-        page with selenium driver
+        page with selenium driver, after each scroll the browser watches the
+        DOM mutations and answers as soon as the new items settle, or after
+        stime seconds without changes at the end of the gallery
 
         Args:
-            driver(driver): selenium driver created to extract de information
-            (firefox, chrome, safari).
-            timeout(int): wating time for the HTTP response to return to the
-            driver and compile the information.
+            brdriver(driver): selenium driver created to extract de
+            information (firefox, chrome, safari).
+            stime(float): max seconds to wait for new items after a scroll.
 
         Raises:
             exp: raise a generic exception if something goes wrong
         """
         try:
-
-            scroll_pause_time = stime
+            # the browser answers the step before the script timeout
+            brdriver.set_script_timeout(DEFAULT_SCROLL_STEP + 5)
 
             # Get scroll height
             last_height = brdriver.execute_script(
                 "return document.body.scrollHeight")
 
             while True:
-                # Scroll down to bottom
-                brdriver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);")
-
-                # Wait to load page
-                time.sleep(scroll_pause_time)
-
-                # Calculate new scroll height and compare with last one
-                new_height = brdriver.execute_script(
-                    "return document.body.scrollHeight")
+                # Scroll down to bottom and wait for the page to load
+                new_height = brdriver.execute_async_script(
+                    SCROLL_SCRIPT,
+                    stime * 1000,
+                    DEFAULT_SCROLL_SETTLE * 1000,
+                    DEFAULT_SCROLL_STEP * 1000)
+
+                # Compare the new scroll height with last one
                 if new_height == last_height:
                     # If heights are the same it will exit the function
                     break
@@ -419,13 +787,17 @@ class Page():
         except Exception as exp:
             Err.reraise(exp, "Page: findin")
 
-    def get_body(self, *args):
+    def get_body(self, *args, **kwargs):
         """
         Request the URL. if succesfull returns the REST page's status code and
         updates the BODY attribute of page() with the information collected it
 
         Args:
             url (str, optional): page url to recover. Defaults to empty str.
+            tag (str, optional): tag searched in the body, in strain mode
+            only its subtrees are parsed. Defaults to None.
+            attrs (dict, optional): attributes that must have the tag.
+            Defaults to None.
 
         Raises:
             exp: raise a generic exception if something goes wrong
@@ -438,16 +810,20 @@ class Page():
 
             # requesting the page with the existing url
             if len(args) == 0:
-                self.request = requests.get(self.url)
-                self.sbody = BeautifulSoup(self.request.content, self.dialect)
+                self.request = self.pool.get(self.url)
+                self.sbody = self.soup(self.request.content,
+                                       tag=kwargs.get("tag"),
+                                       attrs=kwargs.get("attrs"))
                 ans = self.request.status_code
                 self.request.close()
 
             # requesting the page with the url parameter
             elif len(args) > 0:
                 self.url = args[0]
-                self.request = requests.get(self.url)
-                self.sbody = BeautifulSoup(self.request.content, self.dialect)
+                self.request = self.pool.get(self.url)
+                self.sbody = self.soup(self.request.content,
+                                       tag=kwargs.get("tag"),
+                                       attrs=kwargs.get("attrs"))
                 ans = self.request.status_code
                 self.request.close()
 
@@ -477,7 +853,7 @@ class Page():
             # requesting the page with the existing url
             if len(args) == 0:
 
-                self.request = requests.get(self.url)
+                self.request = self.pool.get(self.url)
                 headers = self.request.headers
                 self.shead = dict(**headers)
                 ans = self.request.status_code
@@ -487,7 +863,7 @@ class Page():
             elif len(args) > 0:
 
                 self.url = args[0]
-                self.request = requests.get(self.url)
+                self.request = self.pool.get(self.url)
                 headers = self.request.headers
                 self.shead = dict(**headers)
 
@@ -526,7 +902,7 @@ class Page():
             # requesting the page with the existing url
             if len(args) == 0:
 
-                self.request = requests.get(self.url)
+                self.request = self.pool.get(self.url)
                 self.content = self.request.content
                 ans = self.request.status_code
                 self.request.close()
@@ -535,7 +911,7 @@ class Page():
             elif len(args) > 0:
 
                 self.url = args[0]
-                self.request = requests.get(self.url)
+                self.request = self.pool.get(self.url)
                 self.content = self.request.content
                 ans = self.request.status_code
                 self.request.close()
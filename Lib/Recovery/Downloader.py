@@ -0,0 +1,568 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+from Lib.Recovery.Pool import Pool
+from Lib.Recovery.Store import Store, DEFAULT_HASH
+assert Conf
+assert Err
+assert Pool
+assert Store
+
+# =========================================
+# Global variables
+# =========================================
+# max number of downloads running at the same time
+DEFAULT_WORKERS = 8
+# max number of downloads running at the same time on the same host
+DEFAULT_HOST_LIMIT = 4
+# bytes read from the response and written to disk at once
+DEFAULT_CHUNK_SIZE = 65536
+# sufix of the partial file of a running or interrupted download
+DEFAULT_TEMP_SUFIX = ".part"
+# sufix of the metadata sidecar (ie.: ETag, length) of a downloaded file
+DEFAULT_META_SUFIX = ".meta"
+# check the downloaded files with a HEAD request before skipping them
+DEFAULT_VERIFY = True
+
+
+class Downloader():
+    """
+    this module downloads many files (ie.: artworks images) at once with a
+    bounded pool of worker threads and a per host limit, the response
+    bodies are streamed to disk in chunks into a temporary file renamed
+    when it is complete, so memory stays flat and an interrupted download
+    never leaves a truncated file, an interrupted download is resumed with
+    a Range request and a file matching its metadata sidecar (ETag,
+    Last-Modified, Content-Length) is not downloaded again, with a Store()
+    every URL is downloaded once and linked to all its local filepaths
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    pool = None
+    workers = DEFAULT_WORKERS
+    host_limit = DEFAULT_HOST_LIMIT
+    chunk_size = DEFAULT_CHUNK_SIZE
+    store = None
+    verify = DEFAULT_VERIFY
+    hosts = None
+    urls = None
+    checked = None
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Downloader()
+
+        Args:
+            pool (Pool, optional): HTTP connection pool for the requests.
+            Default is a new Pool()
+            workers (int, optional): max downloads at the same time.
+            Default is 8
+            host_limit (int, optional): max downloads at the same time on the
+            same host. Default is 4
+            chunk_size (int, optional): bytes written to disk at once.
+            Default is 65536
+            store (Store, optional): content addressed store to download
+            each URL only once. Default is None
+            verify (bool, optional): check the downloaded files with a HEAD
+            request, without it the existing files are always kept.
+            Default is True
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.pool = kwargs.get("pool")
+            self.workers = kwargs.get("workers", DEFAULT_WORKERS)
+            self.host_limit = kwargs.get("host_limit", DEFAULT_HOST_LIMIT)
+            self.chunk_size = kwargs.get("chunk_size", DEFAULT_CHUNK_SIZE)
+            self.store = kwargs.get("store")
+            self.verify = kwargs.get("verify", DEFAULT_VERIFY)
+            self.hosts = dict()
+            self.urls = dict()
+            self.checked = set()
+            self.lock = threading.Lock()
+
+            if self.pool is None:
+                self.pool = Pool()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: __init__")
+
+    def host(self, url):
+        """
+        Get the limit of running downloads of the host of an URL, creating
+        it if needed
+
+        Args:
+            url (str): URL to download
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (threading.BoundedSemaphore): limit of the host
+        """
+        try:
+            host = urllib.parse.urlsplit(url).netloc
+            with self.lock:
+                if host not in self.hosts:
+                    limit = threading.BoundedSemaphore(self.host_limit)
+                    self.hosts[host] = limit
+                ans = self.hosts[host]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: host")
+
+    def claim(self, key):
+        """
+        Get the lock of an URL or a filepath, the workers downloading the
+        same URL wait for the first one and reuse its blob
+
+        Args:
+            key (str): URL or local filepath to download
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (threading.Lock): lock of the URL or filepath
+        """
+        try:
+            with self.lock:
+                if key not in self.urls:
+                    self.urls[key] = threading.Lock()
+                ans = self.urls[key]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: claim")
+
+    def fetch(self, url, fp):
+        """
+        Download an URL into a local file, an existing file is only
+        downloaded again if the server says it changed
+
+        Args:
+            url (str): URL to download
+            fp (str): local filepath of the downloaded file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the file is in the local filepath
+        """
+        try:
+            if self.store is not None:
+                ans = self.fetch_blob(url, fp)
+            else:
+                ans = self.fetch_file(url, fp)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: fetch")
+
+    def fetch_file(self, url, fp):
+        """
+        Download an URL into a local file with a metadata sidecar, an
+        existing file is skipped if a HEAD request matches its sidecar
+
+        Args:
+            url (str): URL to download
+            fp (str): local filepath of the downloaded file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the file is in the local filepath
+        """
+        try:
+            ans = True
+            with self.claim(fp):
+                if os.path.exists(fp):
+                    meta = self.sidecar(fp)
+                    size = os.path.getsize(fp)
+                    if self.fresh(url, meta, size):
+                        return ans
+
+                meta = self.download(url, fp)
+                self.describe(fp, meta)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: fetch_file")
+
+    def fetch_blob(self, url, fp):
+        """
+        Download an URL into the store only if it is not already there or
+        changed in the server, and link its blob to a local file
+
+        Args:
+            url (str): URL to download
+            fp (str): local filepath of the linked file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the file is in the local filepath
+        """
+        try:
+            with self.claim(url):
+                # every URL is checked once in a run
+                if url not in self.checked:
+                    digest = self.store.lookup(url)
+                    meta = self.store.meta(url)
+                    if digest is None or not self.fresh(url, meta):
+                        spool = self.store.spool(url)
+                        meta = self.download(url, spool)
+                        self.store.put(url, spool, meta)
+                    self.checked.add(url)
+
+            ans = self.store.link(url, fp)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: fetch_blob")
+
+    def fresh(self, url, meta, size=None):
+        """
+        Check with a HEAD request if a downloaded URL is still the same in
+        the server, comparing its ETag, Last-Modified and Content-Length
+        with the metadata of the download
+
+        Args:
+            url (str): downloaded URL
+            meta (dict): metadata of the download, see download()
+            size (int, optional): size of the local file. Default is None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the download does not need to be repeated
+        """
+        try:
+            ans = True
+            if not self.verify:
+                return ans
+
+            with self.host(url):
+                response = self.pool.head(url, allow_redirects=True)
+                response.close()
+
+            # the server can not tell, keeping the local file
+            if response.status_code != 200:
+                return ans
+
+            head = self.validators(response)
+            meta = meta or dict()
+
+            # a truncated or replaced local file
+            if head["length"] is not None:
+                if size is not None and head["length"] != size:
+                    return False
+                if meta.get("length") is not None:
+                    ans = head["length"] == meta["length"]
+
+            if head["etag"] and meta.get("etag"):
+                ans = ans and head["etag"] == meta["etag"]
+            elif head["modified"] and meta.get("modified"):
+                ans = ans and head["modified"] == meta["modified"]
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: fresh")
+
+    def validators(self, response):
+        """
+        Get the HTTP validators of a response
+
+        Args:
+            response (requests.Response): response of a GET or HEAD request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): etag, modified and length of the response, None if
+            the server does not send them
+        """
+        try:
+            length = response.headers.get("Content-Length")
+            # the full size of a partial response
+            total = response.headers.get("Content-Range", "").split("/")[-1]
+            if response.status_code == 206:
+                length = total if total.isdigit() else None
+
+            ans = {
+                "etag": response.headers.get("ETag"),
+                "modified": response.headers.get("Last-Modified"),
+                "length": int(length) if length else None,
+            }
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: validators")
+
+    def download(self, url, fp):
+        """
+        Request an URL within the limit of its host and stream the body to
+        a local file, a partial file left by an interrupted download is
+        resumed with a Range request if the server did not change it
+
+        Args:
+            url (str): URL to download
+            fp (str): local filepath of the downloaded file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): digest, etag, modified and length of the download
+        """
+        try:
+            part = fp + DEFAULT_TEMP_SUFIX
+            headers = dict()
+            offset = 0
+
+            # asking only for the missing bytes of the same version
+            meta = self.sidecar(part)
+            if os.path.exists(part) and meta is not None:
+                check = meta.get("etag") or meta.get("modified")
+                if check:
+                    offset = os.path.getsize(part)
+                    headers["Range"] = "bytes=%d-" % offset
+                    headers["If-Range"] = check
+
+            with self.host(url):
+                response = self.pool.get(url, stream=True, headers=headers)
+                try:
+                    # the partial file is already complete or invalid
+                    invalid = response.status_code == 416
+                    if not invalid:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            offset = 0
+
+                        ans = self.validators(response)
+                        self.describe(part, ans)
+                        ans["digest"] = self.stream(response, part, offset)
+                finally:
+                    response.close()
+
+            # starting again without the partial file
+            if invalid:
+                self.discard(part)
+                ans = self.download(url, fp)
+                return ans
+
+            # a connection closed before the end of the body
+            size = os.path.getsize(part)
+            if ans["length"] is not None and size != ans["length"]:
+                raise IOError("incomplete download: %s" % url)
+
+            # the file only appears when it is complete
+            os.replace(part, fp)
+            self.discard(part)
+            ans["length"] = size
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: download")
+
+    def stream(self, response, fp, offset=0):
+        """
+        Write the body of a streamed response into a local file, appending
+        it after the first offset bytes when the download is resumed
+
+        Args:
+            response (requests.Response): response requested with stream=True
+            fp (str): local filepath of the partial file
+            offset (int, optional): bytes already in the file. Default is 0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): hex hash of the content, computed while it is written
+        """
+        try:
+            digest = hashlib.new(DEFAULT_HASH)
+
+            # the hash starts with the bytes already downloaded
+            mode = "wb"
+            if offset > 0:
+                mode = "r+b"
+                with open(fp, "rb") as file:
+                    for chunk in iter(lambda: file.read(self.chunk_size), b""):
+                        digest.update(chunk)
+
+            with open(fp, mode) as file:
+                file.seek(offset)
+                file.truncate()
+                for chunk in response.iter_content(self.chunk_size):
+                    file.write(chunk)
+                    digest.update(chunk)
+
+            ans = digest.hexdigest()
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: stream")
+
+    def sidecar(self, fp):
+        """
+        Read the metadata sidecar of a local file
+
+        Args:
+            fp (str): local filepath of the file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): metadata of the file, None without sidecar
+        """
+        try:
+            ans = None
+            meta = fp + DEFAULT_META_SUFIX
+            if os.path.exists(meta):
+                with open(meta, "r", encoding="utf-8") as file:
+                    try:
+                        ans = json.load(file)
+                    except ValueError:
+                        ans = None
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: sidecar")
+
+    def describe(self, fp, meta):
+        """
+        Write the metadata sidecar of a local file
+
+        Args:
+            fp (str): local filepath of the file
+            meta (dict): metadata of the file, see download()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            folder, fn = os.path.split(fp + DEFAULT_META_SUFIX)
+            fd, temp = tempfile.mkstemp(prefix=fn + ".", dir=folder or None)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(meta, file)
+            os.replace(temp, fp + DEFAULT_META_SUFIX)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: describe")
+
+    def discard(self, fp):
+        """
+        Remove a partial file and its sidecar
+
+        Args:
+            fp (str): local filepath of the partial file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            for path in (fp, fp + DEFAULT_META_SUFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: discard")
+
+    def map(self, jobs, errors=False):
+        """
+        Download all the (URL, filepath) jobs with the pool of workers, the
+        answer keeps the same order of the jobs
+
+        Args:
+            jobs (list): tuples with the URL and the local filepath of each
+            download
+            errors (bool, optional): return the exception of a failed
+            download in its place instead of raising it. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): True or the exception of each download
+        """
+        try:
+            ans = list()
+            if len(jobs) == 0:
+                return ans
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(self.fetch, url, fp)
+                           for url, fp in jobs]
+
+                for future in futures:
+                    exp = future.exception()
+                    if exp is not None and not errors:
+                        raise exp
+                    ans.append(future.result() if exp is None else exp)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Downloader: map")
@@ -0,0 +1,197 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import asyncio
+import time
+import urllib.parse
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+from Lib.Recovery.Pool import Pool
+assert Conf
+assert Err
+assert Pool
+
+# =========================================
+# Global variables
+# =========================================
+# max number of requests running at the same time
+DEFAULT_CONCURRENCY = 8
+# max number of requests running at the same time on the same host
+DEFAULT_HOST_LIMIT = 4
+# min waiting time in seconds between two requests to the same host
+DEFAULT_HOST_DELAY = 0.5
+
+
+class Engine():
+    """
+    this module fetch many URLs concurrently with asyncio, bounded by a
+    global concurrency limit and a per host politeness budget, the
+    requests run on the shared Pool() and every response is handed to a
+    parsing function as soon as it arrives
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    pool = None
+    concurrency = DEFAULT_CONCURRENCY
+    host_limit = DEFAULT_HOST_LIMIT
+    host_delay = DEFAULT_HOST_DELAY
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Engine()
+
+        Args:
+            pool (Pool, optional): HTTP connection pool for the requests.
+            Default is a new Pool()
+            concurrency (int, optional): max requests at the same time.
+            Default is 8
+            host_limit (int, optional): max requests at the same time on the
+            same host. Default is 4
+            host_delay (float, optional): min seconds between two requests to
+            the same host. Default is 0.5
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.pool = kwargs.get("pool")
+            self.concurrency = kwargs.get("concurrency", DEFAULT_CONCURRENCY)
+            self.host_limit = kwargs.get("host_limit", DEFAULT_HOST_LIMIT)
+            self.host_delay = kwargs.get("host_delay", DEFAULT_HOST_DELAY)
+
+            if self.pool is None:
+                self.pool = Pool()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Engine: __init__")
+
+    def map(self, func, urls, errors=False):
+        """
+        Request all the URLs concurrently and apply a function to each
+        response, the answer keeps the same order of the URLs
+
+        Args:
+            func (function): function receiving the requests.Response of an
+            URL, ie.: a parser for the page
+            urls (list): list of URLs to request
+            errors (bool, optional): return the exception of a failed URL in
+            its place instead of raising it. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list with the result of func for each URL
+        """
+        try:
+            ans = asyncio.run(self.gather(func, urls, errors))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Engine: map")
+
+    async def gather(self, func, urls, errors=False):
+        """
+        Coroutine scheduling the requests of all the URLs within the
+        concurrency limit and the per host budget
+
+        Args:
+            func (function): function receiving the requests.Response
+            urls (list): list of URLs to request
+            errors (bool, optional): return the exceptions instead of
+            raising them. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): list with the result of func for each URL
+        """
+        try:
+            # limits are created inside the running event loop
+            limit = asyncio.Semaphore(self.concurrency)
+            hosts = dict()
+            for url in urls:
+                host = urllib.parse.urlsplit(url).netloc
+                if host not in hosts:
+                    hosts[host] = {
+                        "limit": asyncio.Semaphore(self.host_limit),
+                        "lock": asyncio.Lock(),
+                        "last": 0.0,
+                    }
+
+            tasks = list()
+            for url in urls:
+                host = urllib.parse.urlsplit(url).netloc
+                tasks.append(self.fetch(func, url, limit, hosts[host]))
+
+            ans = await asyncio.gather(*tasks, return_exceptions=errors)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Engine: gather")
+
+    async def fetch(self, func, url, limit, host):
+        """
+        Coroutine requesting one URL in a worker thread and processing its
+        response with func
+
+        Args:
+            func (function): function receiving the requests.Response
+            url (str): URL to request
+            limit (asyncio.Semaphore): global concurrency limit
+            host (dict): per host limit, lock and last request time
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (any): result of func for the URL response
+        """
+        try:
+            async with limit, host["limit"]:
+                # spacing the requests to the same host
+                async with host["lock"]:
+                    wait = host["last"] + self.host_delay - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    host["last"] = time.monotonic()
+
+                response = await asyncio.to_thread(self.pool.get, url)
+
+            # processing the response outside the request limits
+            ans = await asyncio.to_thread(func, response)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Engine: fetch")
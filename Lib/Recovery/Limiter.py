@@ -0,0 +1,268 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import time
+import threading
+import urllib.parse
+import email.utils
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# starting requests per second for each host
+DEFAULT_RATE = 2.0
+# min and max requests per second for each host
+DEFAULT_MIN_RATE = 0.1
+DEFAULT_MAX_RATE = 20.0
+# requests that can be sent at once after an idle time
+DEFAULT_BURST = 4
+# requests per second added after each fast successful response
+DEFAULT_INCREASE = 0.25
+# rate factor after a 429/503 response
+DEFAULT_DECREASE = 0.5
+# seconds of response time that are considered a slow server
+DEFAULT_SLOW_LATENCY = 2.0
+# rate factor after a slow response
+DEFAULT_SLOW_DECREASE = 0.9
+# max seconds to honor a Retry-After header
+DEFAULT_MAX_RETRY_AFTER = 300.0
+# HTTP status codes asking the client to slow down
+THROTTLE_STATUS = (429, 503)
+
+
+class Limiter():
+    """
+    this module throttles the HTTP requests of each host with a token
+    bucket, the bucket rate grows slowly while the server answers fast and
+    is cut in half (AIMD) when the server is slow, answers 429/503 or asks
+    to wait with a Retry-After header
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    rate = DEFAULT_RATE
+    min_rate = DEFAULT_MIN_RATE
+    max_rate = DEFAULT_MAX_RATE
+    burst = DEFAULT_BURST
+    increase = DEFAULT_INCREASE
+    decrease = DEFAULT_DECREASE
+    slow_latency = DEFAULT_SLOW_LATENCY
+    hosts = None
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Limiter()
+
+        Args:
+            rate (float, optional): starting requests per second for each
+            host. Default is 2.0
+            min_rate (float, optional): min requests per second. Default is
+            0.1
+            max_rate (float, optional): max requests per second. Default is
+            20.0
+            burst (int, optional): requests sent at once after an idle time.
+            Default is 4
+            increase (float, optional): requests per second added after a
+            fast response. Default is 0.25
+            decrease (float, optional): rate factor after a 429/503 response.
+            Default is 0.5
+            slow_latency (float, optional): seconds of a slow response.
+            Default is 2.0
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.rate = kwargs.get("rate", DEFAULT_RATE)
+            self.min_rate = kwargs.get("min_rate", DEFAULT_MIN_RATE)
+            self.max_rate = kwargs.get("max_rate", DEFAULT_MAX_RATE)
+            self.burst = kwargs.get("burst", DEFAULT_BURST)
+            self.increase = kwargs.get("increase", DEFAULT_INCREASE)
+            self.decrease = kwargs.get("decrease", DEFAULT_DECREASE)
+            self.slow_latency = kwargs.get("slow_latency",
+                                           DEFAULT_SLOW_LATENCY)
+            self.hosts = dict()
+            self.lock = threading.Lock()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: __init__")
+
+    def bucket(self, url):
+        """
+        Get the token bucket of the host of an URL, creating it if needed
+
+        Args:
+            url (str): requested URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): rate, tokens, last refill time and blocked time of
+            the host
+        """
+        try:
+            host = urllib.parse.urlsplit(url).netloc
+            with self.lock:
+                if host not in self.hosts:
+                    self.hosts[host] = {
+                        "rate": self.rate,
+                        "tokens": float(self.burst),
+                        "last": time.monotonic(),
+                        "blocked": 0.0,
+                    }
+                ans = self.hosts[host]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: bucket")
+
+    def acquire(self, url):
+        """
+        Wait until the host of an URL can receive a new request
+
+        Args:
+            url (str): URL to request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds waited
+        """
+        try:
+            bucket = self.bucket(url)
+
+            # taking a token, a negative bucket is a queue of reservations
+            with self.lock:
+                now = time.monotonic()
+                tokens = bucket["tokens"]
+                tokens += (now - bucket["last"]) * bucket["rate"]
+                tokens = min(float(self.burst), tokens) - 1.0
+                bucket["tokens"] = tokens
+                bucket["last"] = now
+
+                ans = max(0.0, bucket["blocked"] - now)
+                if tokens < 0:
+                    ans = max(ans, -tokens / bucket["rate"])
+
+            if ans > 0:
+                time.sleep(ans)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: acquire")
+
+    def feedback(self, url, response, latency):
+        """
+        Adapt the rate of the host of an URL with the answer of the server
+
+        Args:
+            url (str): requested URL
+            response (requests.Response): response of the request
+            latency (float): seconds the request took
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): new requests per second of the host
+        """
+        try:
+            bucket = self.bucket(url)
+
+            with self.lock:
+                rate = bucket["rate"]
+
+                # the server asks to slow down
+                if response.status_code in THROTTLE_STATUS:
+                    rate = rate * self.decrease
+                    wait = self.retry_after(response)
+                    if wait > 0:
+                        bucket["blocked"] = max(bucket["blocked"],
+                                                time.monotonic() + wait)
+
+                # the server is struggling
+                elif latency > self.slow_latency:
+                    rate = rate * DEFAULT_SLOW_DECREASE
+
+                # the server handles the load
+                else:
+                    rate = rate + self.increase
+
+                bucket["rate"] = min(self.max_rate, max(self.min_rate, rate))
+                ans = bucket["rate"]
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: feedback")
+
+    def retry_after(self, response):
+        """
+        Read the seconds to wait from the Retry-After header of a response,
+        in seconds or as an HTTP date
+
+        Args:
+            response (requests.Response): response of the request
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): seconds to wait, 0.0 without the header
+        """
+        try:
+            ans = 0.0
+            value = response.headers.get("Retry-After")
+
+            if value is not None:
+                value = value.strip()
+                if value.isdigit():
+                    ans = float(value)
+                else:
+                    date = email.utils.parsedate_to_datetime(value)
+                    ans = date.timestamp() - time.time()
+
+            ans = min(DEFAULT_MAX_RETRY_AFTER, max(0.0, ans))
+            return ans
+
+        # exception handling
+        except (TypeError, ValueError):
+            return 0.0
+        except Exception as exp:
+            Err.reraise(exp, "Limiter: retry_after")
@@ -0,0 +1,154 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Third party imports
+# =========================================
+from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from bs4.builder import builder_registry
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# pure python parser, always installed with beautifulSoup
+DEFAULT_HTML_PARSER = "html.parser"
+# parser that ignores the parse_only filters of beautifulSoup
+FULL_TREE_PARSERS = ("html5lib",)
+
+
+class Parser():
+    """
+    this module selects the beautifulSoup parser backend (ie.: the C
+    accelerated lxml) used to read the HTML pages, if the backend is not
+    installed it falls back to the pure python html.parser
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    dialect = DEFAULT_HTML_PARSER
+    backend = DEFAULT_HTML_PARSER
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Parser()
+
+        Args:
+            dialect (str, optional): beautifulSoup parser dialect, ie.: lxml,
+            html5lib. Default is "html.parser"
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.dialect = DEFAULT_HTML_PARSER
+
+            # requested parser dialect
+            if len(args) > 0 and args[0]:
+                self.dialect = args[0]
+
+            self.backend = self.resolve(self.dialect)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Parser: __init__")
+
+    def resolve(self, dialect):
+        """
+        Get the installed beautifulSoup backend for a parser dialect
+
+        Args:
+            dialect (str): beautifulSoup parser dialect, ie.: lxml
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): the dialect if it is installed, "html.parser" otherwise
+        """
+        try:
+            ans = DEFAULT_HTML_PARSER
+            features = [feat.strip() for feat in dialect.split(",")]
+            if builder_registry.lookup(*features) is not None:
+                ans = dialect
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Parser: resolve")
+
+    def strainer(self, tag, attrs=None):
+        """
+        Create a filter to parse only the subtrees of a tag and attributes,
+        the rest of the document is never materialized
+
+        Args:
+            tag (str): HTML tag of the subtrees, ie.: "div"
+            attrs (dict, optional): attributes the tag must have. Default is
+            None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (SoupStrainer): parse_only filter, None if the backend always
+            builds the whole document
+        """
+        try:
+            ans = None
+            if self.backend not in FULL_TREE_PARSERS:
+                ans = SoupStrainer(tag, attrs=attrs or {})
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Parser: strainer")
+
+    def parse(self, markup, **kwargs):
+        """
+        Parse an HTML document with the selected backend
+
+        Args:
+            markup (str/bytes): HTML document to parse
+            kwargs (dict, optional): extra arguments for beautifulSoup,
+            ie.: parse_only
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (BeautifulSoup): parsed document
+        """
+        try:
+            ans = BeautifulSoup(markup, self.backend, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Parser: parse")
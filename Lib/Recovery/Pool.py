@@ -0,0 +1,248 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import time
+
+# =========================================
+# Third party imports
+# =========================================
+import requests
+from requests.adapters import HTTPAdapter
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+from Lib.Recovery.Limiter import Limiter, THROTTLE_STATUS
+assert Conf
+assert Err
+assert Limiter
+
+# =========================================
+# Global variables
+# =========================================
+# number of host connection pools to keep alive
+DEFAULT_POOL_CONNECTIONS = 4
+# max number of keep-alive connections per host
+DEFAULT_POOL_MAXSIZE = 8
+# wait for a free connection instead of opening more than maxsize per host
+DEFAULT_POOL_BLOCK = True
+# retries for failed connections and throttled (429/503) requests
+DEFAULT_MAX_RETRIES = 3
+# (connect, read) timeout in seconds for every request
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+
+class Pool():
+    """
+    this module keeps a single HTTP session with a keep-alive connection
+    pool, every Page() using it reuses the same TCP/TLS connections and the
+    same adaptive Limiter() pacing the requests of each host
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    session = None
+    cache = None
+    limiter = None
+    retries = DEFAULT_MAX_RETRIES
+    timeout = DEFAULT_TIMEOUT
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Pool()
+
+        Args:
+            connections (int, optional): number of host pools to keep alive.
+            Default is 4
+            maxsize (int, optional): max keep-alive connections per host.
+            Default is 8
+            block (bool, optional): wait for a free connection when the host
+            pool is full. Default is True
+            retries (int, optional): connection and throttled request
+            retries. Default is 3
+            timeout (tuple, optional): (connect, read) timeout in seconds.
+            Default is (10.0, 60.0)
+            cache (Cache, optional): persistent response cache for the GET
+            requests. Default is None
+            limiter (Limiter, optional): adaptive rate limiter for the
+            requests of each host, None to disable it. Default is a new
+            Limiter()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            connections = kwargs.get("connections", DEFAULT_POOL_CONNECTIONS)
+            maxsize = kwargs.get("maxsize", DEFAULT_POOL_MAXSIZE)
+            block = kwargs.get("block", DEFAULT_POOL_BLOCK)
+            self.retries = kwargs.get("retries", DEFAULT_MAX_RETRIES)
+            self.timeout = kwargs.get("timeout", DEFAULT_TIMEOUT)
+            self.cache = kwargs.get("cache")
+            self.limiter = kwargs.get("limiter", Limiter())
+
+            # mounting the same adapter for http and https requests
+            adapter = HTTPAdapter(pool_connections=connections,
+                                  pool_maxsize=maxsize,
+                                  max_retries=self.retries,
+                                  pool_block=block)
+            self.session = requests.Session()
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: __init__")
+
+    def get(self, url, **kwargs):
+        """
+        Request an URL with a GET using the keep-alive connection pool, if
+        the pool has a cache fresh responses are served locally and stale
+        ones are revalidated with If-None-Match/If-Modified-Since
+
+        Args:
+            url (str): URL to request
+            kwargs (dict, optional): extra arguments for requests, ie.: headers
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): response of the request
+        """
+        try:
+            kwargs.setdefault("timeout", self.timeout)
+
+            # streamed downloads skip the cache
+            if self.cache is None or kwargs.get("stream"):
+                ans = self.send("GET", url, **kwargs)
+                return ans
+
+            entry = self.cache.load(url)
+
+            # cache hit, served locally
+            if entry is not None and self.cache.fresh(entry):
+                ans = self.cache.respond(entry)
+                return ans
+
+            # stale entry, asking the server if it changed
+            if entry is not None:
+                headers = dict(kwargs.get("headers") or {})
+                headers.update(self.cache.validators(entry))
+                kwargs["headers"] = headers
+
+            ans = self.send("GET", url, **kwargs)
+
+            if ans.status_code == 304 and entry is not None:
+                entry = self.cache.refresh(url, entry, ans)
+                ans.close()
+                ans = self.cache.respond(entry)
+
+            elif ans.status_code == 200:
+                self.cache.store(url, ans)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: get")
+
+    def head(self, url, **kwargs):
+        """
+        Request an URL with a HEAD using the keep-alive connection pool
+
+        Args:
+            url (str): URL to request
+            kwargs (dict, optional): extra arguments for requests, ie.: headers
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): response of the request
+        """
+        try:
+            kwargs.setdefault("timeout", self.timeout)
+            ans = self.send("HEAD", url, **kwargs)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: head")
+
+    def send(self, method, url, **kwargs):
+        """
+        Send a request through the rate limiter, the throttled (429/503)
+        requests are retried once the limiter allows it
+
+        Args:
+            method (str): HTTP method, ie.: GET, HEAD
+            url (str): URL to request
+            kwargs (dict, optional): extra arguments for requests, ie.: headers
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (requests.Response): response of the request
+        """
+        try:
+            attempt = 0
+            while True:
+                if self.limiter is not None:
+                    self.limiter.acquire(url)
+
+                start = time.monotonic()
+                ans = self.session.request(method, url, **kwargs)
+
+                if self.limiter is not None:
+                    latency = time.monotonic() - start
+                    self.limiter.feedback(url, ans, latency)
+
+                if ans.status_code not in THROTTLE_STATUS:
+                    return ans
+                if attempt >= self.retries:
+                    return ans
+
+                ans.close()
+                attempt += 1
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: send")
+
+    def close(self):
+        """
+        Close all the keep-alive connections in the pool
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.session.close()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Pool: close")
@@ -0,0 +1,277 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import threading
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# file with the URL, validators and content hash of every stored blob
+DEFAULT_INDEX_FILE = "index.jsonl"
+# folder of the downloads that are not in the store yet
+DEFAULT_SPOOL_FOLDER = "spool"
+# hash algorithm of the blobs content
+DEFAULT_HASH = "sha256"
+
+
+class Store():
+    """
+    this module keeps a content addressed store of downloaded files (ie.:
+    artworks images), every blob is saved once under the hash of its
+    content and an index remembers the hash and the HTTP validators (ETag,
+    Last-Modified, Content-Length) of every downloaded URL, the letters
+    folders get hardlinks to the blobs so a repeated artwork is
+    downloaded and saved only once
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    path = str()
+    urls = None
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Store()
+
+        Args:
+            path (str): local dirpath of the blobs and the index, it must be
+            in the same disk of the linked files
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.path = str()
+            self.urls = dict()
+            self.lock = threading.Lock()
+
+            # local dirpath of the store
+            if len(args) > 0:
+                self.path = args[0]
+
+            os.makedirs(os.path.join(self.path, DEFAULT_SPOOL_FOLDER),
+                        exist_ok=True)
+            self.load()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: __init__")
+
+    def load(self):
+        """
+        Load the index of the URLs already in the store
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            fp = os.path.join(self.path, DEFAULT_INDEX_FILE)
+            if os.path.exists(fp):
+                with open(fp, "r", encoding="utf-8") as file:
+                    for line in file:
+                        # a half written entry is ignored
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        self.urls[entry.pop("url")] = entry
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: load")
+
+    def blob(self, digest):
+        """
+        Get the local filepath of a blob, the blobs are spread in folders
+        named after the first characters of their hash
+
+        Args:
+            digest (str): hex hash of the blob content
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): local filepath of the blob
+        """
+        try:
+            ans = os.path.join(self.path, digest[:2], digest)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: blob")
+
+    def lookup(self, url):
+        """
+        Get the hash of the blob of an already downloaded URL
+
+        Args:
+            url (str): downloaded URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): hex hash of the blob, None if the URL is not stored
+        """
+        try:
+            ans = self.meta(url).get("digest")
+            if ans is not None and not os.path.exists(self.blob(ans)):
+                ans = None
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: lookup")
+
+    def meta(self, url):
+        """
+        Get the metadata of a downloaded URL (ie.: digest, etag, modified,
+        length)
+
+        Args:
+            url (str): downloaded URL
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): metadata of the URL, empty if it is not stored
+        """
+        try:
+            with self.lock:
+                ans = dict(self.urls.get(url, dict()))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: meta")
+
+    def spool(self, url):
+        """
+        Get the local filepath to download an URL before storing it, the
+        same URL always gets the same filepath so a partial download can be
+        resumed
+
+        Args:
+            url (str): URL to download
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): local filepath in the store spool
+        """
+        try:
+            key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+            ans = os.path.join(self.path, DEFAULT_SPOOL_FOLDER, key)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: spool")
+
+    def put(self, url, fp, meta):
+        """
+        Move a downloaded file into the store and index its URL, the file
+        is dropped if the store already has the same content
+
+        Args:
+            url (str): downloaded URL
+            fp (str): local filepath of the download, see spool()
+            meta (dict): digest and HTTP validators of the download
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            blob = self.blob(meta["digest"])
+            if os.path.exists(blob):
+                os.remove(fp)
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                os.replace(fp, blob)
+
+            with self.lock:
+                self.urls[url] = dict(meta)
+                line = dict(url=url, **meta)
+                fp = os.path.join(self.path, DEFAULT_INDEX_FILE)
+                with open(fp, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(line) + "\n")
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: put")
+
+    def link(self, url, fp):
+        """
+        Make a stored URL appear in a local filepath with a hardlink to its
+        blob, the blob is copied if the disk does not support hardlinks and
+        an old file in the filepath is replaced
+
+        Args:
+            url (str): downloaded URL, see put()
+            fp (str): local filepath of the file, ie.: Artworks/<ID>/<img>.jpg
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the file is in the local filepath
+        """
+        try:
+            ans = True
+            blob = self.blob(self.meta(url)["digest"])
+
+            if os.path.exists(fp) and os.path.samefile(blob, fp):
+                return ans
+
+            # the new file only appears when it is complete
+            temp = fp + "." + uuid.uuid4().hex
+            try:
+                os.link(blob, temp)
+            except OSError:
+                shutil.copyfile(blob, temp)
+            os.replace(temp, fp)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Store: link")
@@ -0,0 +1,656 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import sqlite3
+import threading
+import itertools
+
+# =========================================
+# Third party imports
+# =========================================
+import pandas as pd
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# column with the letter ID (route)
+DEFAULT_KEY = "ID"
+# columns with the artworks of a letter, one value per artwork
+DEFAULT_ARTWORKS = [
+    "ARTWORKSTITLE",
+    "ARTWORKSF",
+    "ARTWORKSJH",
+    "ARTWORKSLINK",
+    "ARTWORKSID",
+]
+# column with the artwork ID inside a letter
+DEFAULT_ARTWORK_KEY = "ARTWORKSID"
+# indexed columns of the letters and of the artworks
+DEFAULT_INDEXES = ["AUTHOR", "ADDRESSEE", "DATE"]
+DEFAULT_CATALOGS = ["ARTWORKSF", "ARTWORKSJH"]
+# separator of the artworks values in the gallery columns
+DEFAULT_SEPARATOR = ", "
+# table names
+LETTERS_TABLE = "letters"
+ARTWORKS_TABLE = "artworks"
+
+
+class Database():
+    """
+    this module keeps the letters in an embedded SQLite database, one row
+    per letter (route) and an artworks child table keyed by letter and
+    artwork ID, the author, addressee, date and F/JH catalog numbers are
+    indexed and every upsert of a batch of letters is one transaction
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    path = str()
+    key = DEFAULT_KEY
+    schema = list()
+    columns = list()
+    artworks = list()
+    artwork_key = DEFAULT_ARTWORK_KEY
+    indexes = list()
+    catalogs = list()
+    separator = DEFAULT_SEPARATOR
+    conn = None
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Database()
+
+        Args:
+            path (str): local filepath of the SQLite file, ":memory:" keeps
+            the database in memory
+            columns (list, optional): gallery column names, the artworks
+            columns go to the artworks table. Default is empty
+            key (str, optional): column of the letter ID. Default is "ID"
+            artworks (list, optional): artworks column names. Default is
+            ARTWORKSTITLE, ARTWORKSF, ARTWORKSJH, ARTWORKSLINK, ARTWORKSID
+            artwork_key (str, optional): column of the artwork ID. Default is
+            "ARTWORKSID"
+            indexes (list, optional): indexed letters columns. Default is
+            AUTHOR, ADDRESSEE, DATE
+            catalogs (list, optional): indexed artworks columns. Default is
+            ARTWORKSF, ARTWORKSJH
+            separator (str, optional): separator of the artworks values in
+            the gallery columns. Default is ", "
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.path = str()
+            self.key = kwargs.get("key", DEFAULT_KEY)
+            self.schema = list(kwargs.get("columns", list()))
+            self.artworks = list(kwargs.get("artworks", DEFAULT_ARTWORKS))
+            self.artwork_key = kwargs.get("artwork_key", DEFAULT_ARTWORK_KEY)
+            self.indexes = list(kwargs.get("indexes", DEFAULT_INDEXES))
+            self.catalogs = list(kwargs.get("catalogs", DEFAULT_CATALOGS))
+            self.separator = kwargs.get("separator", DEFAULT_SEPARATOR)
+            self.lock = threading.Lock()
+
+            # local filepath of the database
+            if len(args) > 0:
+                self.path = args[0]
+
+            # the letters columns are the gallery columns without artworks
+            if self.key not in self.schema:
+                self.schema.insert(0, self.key)
+            for col in self.artworks:
+                if col not in self.schema:
+                    self.schema.append(col)
+            self.columns = [col for col in self.schema
+                            if col not in self.artworks]
+
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.create()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: __init__")
+
+    def create(self):
+        """
+        Create the letters and artworks tables and their indexes if they do
+        not exist, new gallery columns are added to the letters table
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock, self.conn:
+                self.conn.execute("PRAGMA journal_mode=WAL")
+
+                cols = ", ".join(self.quote(col) + " TEXT"
+                                 for col in self.columns
+                                 if col != self.key)
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS " + LETTERS_TABLE + " (" +
+                    self.quote(self.key) + " TEXT PRIMARY KEY" +
+                    (", " + cols if cols else "") + ")")
+
+                arts = ", ".join(self.quote(col) + " TEXT"
+                                 for col in self.artworks
+                                 if col != self.artwork_key)
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS " + ARTWORKS_TABLE + " (" +
+                    self.quote(self.key) + " TEXT NOT NULL, " +
+                    self.quote(self.artwork_key) + " TEXT NOT NULL, " +
+                    "POSITION INTEGER" + (", " + arts if arts else "") +
+                    ", PRIMARY KEY (" + self.quote(self.key) + ", " +
+                    self.quote(self.artwork_key) + "))")
+
+                # columns of a newer gallery schema
+                info = self.conn.execute(
+                    "PRAGMA table_info(" + LETTERS_TABLE + ")")
+                known = [row[1] for row in info]
+                for col in self.columns:
+                    if col not in known:
+                        self.conn.execute(
+                            "ALTER TABLE " + LETTERS_TABLE + " ADD COLUMN " +
+                            self.quote(col) + " TEXT")
+
+                for col in self.indexes:
+                    if col in self.columns:
+                        self.index(LETTERS_TABLE, col)
+                for col in self.catalogs:
+                    if col in self.artworks:
+                        self.index(ARTWORKS_TABLE, col)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: create")
+
+    def index(self, table, column):
+        """
+        Create the index of a column if it does not exist
+
+        Args:
+            table (str): table name
+            column (str): column name
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            name = self.quote("idx_" + table + "_" + column.lower())
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS " + name + " ON " + table +
+                " (" + self.quote(column) + ")")
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: index")
+
+    def quote(self, name):
+        """
+        Quote a column name for the SQL statements
+
+        Args:
+            name (str): column name
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): quoted column name
+        """
+        try:
+            ans = '"' + str(name).replace('"', '""') + '"'
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: quote")
+
+    def value(self, value):
+        """
+        Convert a gallery value into a SQLite value, the empty values
+        (None, NaN) are NULL
+
+        Args:
+            value (any): gallery value
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): text of the value, None if it is empty
+        """
+        try:
+            ans = None
+            if value is not None and not (isinstance(value, float)
+                                          and value != value):
+                ans = str(value)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: value")
+
+    def split(self, record):
+        """
+        Split the artworks columns of a letter into one row per artwork
+
+        Args:
+            record (dict): gallery columns of the letter
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): artworks rows with the artworks columns and their
+            position in the letter
+        """
+        try:
+            values = [self.parts(record.get(col)) for col in self.artworks]
+
+            ans = list()
+            rows = itertools.zip_longest(*values, fillvalue=str())
+            for pos, row in enumerate(rows):
+                art = dict(zip(self.artworks, row))
+                # artworks without ID keep their position as ID
+                if not art[self.artwork_key]:
+                    art[self.artwork_key] = str(pos)
+                art["POSITION"] = pos
+                ans.append(art)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: split")
+
+    def parts(self, value):
+        """
+        Get the values of the artworks of a letter from a gallery column,
+        the scrapped columns are lists, a loaded CSV has them as "[...]"
+        texts and the joined columns are texts with the separator
+
+        Args:
+            value (list/str): artworks column of the letter
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): texts of the artworks values
+        """
+        try:
+            ans = list()
+            if isinstance(value, (list, tuple)):
+                ans = [str(part).strip() for part in value]
+                return ans
+
+            text = (self.value(value) or str()).strip()
+
+            # list in str format, as Controller.from_str_to_list() reads it
+            if text.startswith("[") and text.endswith("]"):
+                for part in text[1:-1].split(","):
+                    part = part.strip().strip("'\"").strip()
+                    if part:
+                        ans.append(part)
+
+            elif text:
+                ans = [part.strip() for part in text.split(self.separator)]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: parts")
+
+    def upsert(self, records):
+        """
+        Insert or update a batch of letters in one transaction, only the
+        columns in each record are written and the artworks of a letter are
+        replaced when the record has any artworks column
+
+        Args:
+            records (list): dicts with the letter ID and the changed columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters written
+        """
+        try:
+            ans = 0
+            with self.lock, self.conn:
+                for record in records:
+                    route = self.value(record[self.key])
+                    cols = [col for col in self.columns
+                            if col in record and col != self.key]
+
+                    # partial update of the given columns
+                    names = [self.key] + cols
+                    sql = ("INSERT INTO " + LETTERS_TABLE + " (" +
+                           ", ".join(map(self.quote, names)) + ") VALUES (" +
+                           ", ".join("?" * len(names)) + ")")
+                    if cols:
+                        sql += (" ON CONFLICT (" + self.quote(self.key) +
+                                ") DO UPDATE SET " +
+                                ", ".join(self.quote(col) + " = excluded." +
+                                          self.quote(col) for col in cols))
+                    else:
+                        sql += " ON CONFLICT DO NOTHING"
+                    params = [route] + [self.value(record[col])
+                                        for col in cols]
+                    self.conn.execute(sql, params)
+
+                    if any(col in record for col in self.artworks):
+                        self.replace(route, self.split(record))
+                    ans += 1
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: upsert")
+
+    def replace(self, route, artworks):
+        """
+        Replace the artworks of a letter, it runs inside the upsert()
+        transaction
+
+        Args:
+            route (str): letter ID
+            artworks (list): artworks rows of the letter, see split()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.conn.execute(
+                "DELETE FROM " + ARTWORKS_TABLE + " WHERE " +
+                self.quote(self.key) + " = ?", (route,))
+
+            names = [self.key, "POSITION"] + self.artworks
+            sql = ("INSERT OR REPLACE INTO " + ARTWORKS_TABLE + " (" +
+                   ", ".join(map(self.quote, names)) + ") VALUES (" +
+                   ", ".join("?" * len(names)) + ")")
+            self.conn.executemany(
+                sql, [[route, art["POSITION"]] +
+                      [art[col] for col in self.artworks]
+                      for art in artworks])
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: replace")
+
+    def delete(self, routes):
+        """
+        Delete letters and their artworks in one transaction
+
+        Args:
+            routes (list): letter IDs
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters deleted
+        """
+        try:
+            ans = 0
+            params = [(self.value(route),) for route in routes]
+            with self.lock, self.conn:
+                for table in (ARTWORKS_TABLE, LETTERS_TABLE):
+                    cur = self.conn.executemany(
+                        "DELETE FROM " + table + " WHERE " +
+                        self.quote(self.key) + " = ?", params)
+                ans = cur.rowcount
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: delete")
+
+    def get(self, route):
+        """
+        Get a letter with its artworks joined as in the gallery columns
+
+        Args:
+            route (str): letter ID
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): gallery columns of the letter, None if it is not in
+            the database
+        """
+        try:
+            ans = None
+            with self.lock:
+                cur = self.conn.execute(
+                    "SELECT " + ", ".join(map(self.quote, self.columns)) +
+                    " FROM " + LETTERS_TABLE + " WHERE " +
+                    self.quote(self.key) + " = ?", (self.value(route),))
+                row = cur.fetchone()
+                if row is not None:
+                    ans = dict(zip(self.columns, row))
+                    ans.update(self.join(ans[self.key]))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: get")
+
+    def join(self, route):
+        """
+        Join the artworks of a letter into the gallery columns, a column
+        without values for every artwork is an empty text
+
+        Args:
+            route (str): letter ID
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): artworks columns with the joined values
+        """
+        try:
+            cur = self.conn.execute(
+                "SELECT " + ", ".join(map(self.quote, self.artworks)) +
+                " FROM " + ARTWORKS_TABLE + " WHERE " +
+                self.quote(self.key) + " = ? ORDER BY POSITION", (route,))
+            rows = cur.fetchall()
+            ans = dict()
+            for i, col in enumerate(self.artworks):
+                values = [row[i] for row in rows]
+                # a column without values is empty, not a lone separator
+                if all(not value for value in values):
+                    values = list()
+                ans[col] = self.separator.join(values)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: join")
+
+    def find(self, column, value):
+        """
+        Find the letters with a value in an indexed column, the artworks
+        columns (ie.: F/JH catalog numbers) look in the artworks table
+
+        Args:
+            column (str): letters or artworks column name
+            value (str): value to look for
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): letter IDs in insertion order
+        """
+        try:
+            table = LETTERS_TABLE
+            if column in self.artworks:
+                table = ARTWORKS_TABLE
+
+            with self.lock:
+                cur = self.conn.execute(
+                    "SELECT DISTINCT " + self.quote(self.key) + " FROM " +
+                    table + " WHERE " + self.quote(column) + " = ? " +
+                    "ORDER BY rowid", (self.value(value),))
+                ans = [row[0] for row in cur]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: find")
+
+    def column(self, column, size=1000):
+        """
+        Stream the values of a letters column in insertion order without
+        loading the whole column in memory
+
+        Args:
+            column (str): letters column name
+            size (int, optional): rows read at once. Default is 1000
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (generator): values of the column
+        """
+        try:
+            # a new cursor for each stream, the lock is only held per batch
+            cur = self.conn.cursor()
+            with self.lock:
+                cur.execute("SELECT " + self.quote(column) + " FROM " +
+                            LETTERS_TABLE + " ORDER BY rowid")
+            while True:
+                with self.lock:
+                    rows = cur.fetchmany(size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0]
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: column")
+
+    def count(self):
+        """
+        Count the letters in the database
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters
+        """
+        try:
+            with self.lock:
+                cur = self.conn.execute("SELECT COUNT(*) FROM " +
+                                        LETTERS_TABLE)
+                ans = cur.fetchone()[0]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: count")
+
+    def from_frame(self, data_frame, columns=None):
+        """
+        Upsert the letters of a gallery dataframe
+
+        Args:
+            data_frame (data_frame): pandas df with the gallery
+            columns (list, optional): column names to write. Default is None
+            to write all the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of letters written
+        """
+        try:
+            cols = list(data_frame.columns)
+            if columns is not None:
+                cols = [col for col in cols
+                        if col in columns or col == self.key]
+            records = data_frame[cols].to_dict("records")
+            ans = self.upsert(records)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: from_frame")
+
+    def to_frame(self):
+        """
+        Build a gallery dataframe with all the letters and their artworks
+        joined in the gallery columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (data_frame): pandas df with the gallery
+        """
+        try:
+            with self.lock:
+                cur = self.conn.execute(
+                    "SELECT " + ", ".join(map(self.quote, self.columns)) +
+                    " FROM " + LETTERS_TABLE + " ORDER BY rowid")
+                data = [dict(zip(self.columns, row)) for row in cur]
+                for record in data:
+                    record.update(self.join(record[self.key]))
+            ans = pd.DataFrame(data, columns=self.schema)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: to_frame")
+
+    def close(self):
+        """
+        Close the database connection
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            with self.lock:
+                self.conn.close()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Database: close")
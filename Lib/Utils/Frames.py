@@ -0,0 +1,419 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import json
+import uuid
+import warnings
+import importlib.util
+
+# =========================================
+# Third party imports
+# =========================================
+import pandas as pd
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# file with the column order, file names and rows of the stored frame
+DEFAULT_MANIFEST_FILE = "manifest.json"
+# columnar file formats and their compression, pickle needs no extra library
+FRAME_FORMATS = {
+    "parquet": "zstd",
+    "feather": "zstd",
+    "pickle": "gzip",
+}
+# libraries able to write each columnar format
+FORMAT_ENGINES = {
+    "parquet": ("pyarrow", "fastparquet"),
+    "feather": ("pyarrow",),
+    "pickle": ("pandas",),
+}
+# format used when the requested one is not installed
+DEFAULT_FRAME_FORMAT = "pickle"
+
+
+class Frames():
+    """
+    this module keeps a dataframe (ie.: the gallery) in a binary columnar
+    folder, every column is a compressed file (parquet, feather or pickle)
+    and a manifest keeps their order, so a column can be read, replaced or
+    appended without rewriting the big text columns
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    fmt = DEFAULT_FRAME_FORMAT
+    compression = FRAME_FORMATS[DEFAULT_FRAME_FORMAT]
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Frames()
+
+        Args:
+            fmt (str, optional): columnar file format, ie.: parquet, feather
+            or pickle. Default is "pickle"
+            compression (str, optional): compression of the column files.
+            Default is the best one of the format
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.fmt = DEFAULT_FRAME_FORMAT
+
+            # requested file format
+            if len(args) > 0 and args[0]:
+                self.fmt = self.resolve(args[0])
+
+            self.compression = kwargs.get("compression",
+                                          FRAME_FORMATS[self.fmt])
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: __init__")
+
+    def resolve(self, fmt):
+        """
+        Get the installed columnar format for a requested format, a
+        warning tells when the requested format is replaced
+
+        Args:
+            fmt (str): columnar file format, ie.: parquet
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): the format if a library can write it, "pickle"
+            otherwise
+        """
+        try:
+            ans = DEFAULT_FRAME_FORMAT
+            engines = FORMAT_ENGINES.get(fmt, tuple())
+            if any(importlib.util.find_spec(eng) for eng in engines):
+                ans = fmt
+            else:
+                warnings.warn("Frames: the " + str(fmt) + " format is not " +
+                              "installed, using " + ans + " files instead",
+                              RuntimeWarning)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: resolve")
+
+    def manifest(self, path):
+        """
+        Read the manifest of a stored frame
+
+        Args:
+            path (str): local dirpath of the stored frame
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): column order, column files with their compression
+            and rows, empty columns if the frame is not stored
+        """
+        try:
+            ans = {"columns": list(), "files": dict(), "rows": 0}
+            fp = os.path.join(path, DEFAULT_MANIFEST_FILE)
+            if os.path.exists(fp):
+                with open(fp, "r", encoding="utf-8") as file:
+                    ans = json.load(file)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: manifest")
+
+    def commit(self, path, manifest):
+        """
+        Write the manifest of a stored frame, the old manifest is replaced
+        only when the new one is complete
+
+        Args:
+            path (str): local dirpath of the stored frame
+            manifest (dict): column order, column files with their
+            compression and rows
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            fp = os.path.join(path, DEFAULT_MANIFEST_FILE)
+            temp = fp + "." + uuid.uuid4().hex
+            with open(temp, "w", encoding="utf-8") as file:
+                json.dump(manifest, file, indent=1)
+            os.replace(temp, fp)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: commit")
+
+    def exists(self, path):
+        """
+        Check if a frame is stored in a local dirpath
+
+        Args:
+            path (str): local dirpath of the stored frame
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the frame manifest exists
+        """
+        try:
+            ans = os.path.exists(os.path.join(path, DEFAULT_MANIFEST_FILE))
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: exists")
+
+    def modified(self, path):
+        """
+        Get the last time a stored frame was saved
+
+        Args:
+            path (str): local dirpath of the stored frame
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (float): modification time of the manifest, None if the
+            frame is not stored
+        """
+        try:
+            ans = None
+            fp = os.path.join(path, DEFAULT_MANIFEST_FILE)
+            if os.path.exists(fp):
+                ans = os.path.getmtime(fp)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: modified")
+
+    def stamp(self, path):
+        """
+        Mark a stored frame as saved now without writing it (ie.: a CSV
+        file with the same data was just exported)
+
+        Args:
+            path (str): local dirpath of the stored frame
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            fp = os.path.join(path, DEFAULT_MANIFEST_FILE)
+            if os.path.exists(fp):
+                os.utime(fp)
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: stamp")
+
+    def save(self, path, data_frame, columns=None, drop=False):
+        """
+        Save the columns of a dataframe in a local dirpath, only the given
+        columns are written and the other stored columns are kept, a new
+        number of rows rewrites all the columns
+
+        Args:
+            path (str): local dirpath of the stored frame
+            data_frame (data_frame): pandas df to save
+            columns (list, optional): column names to write. Default is None
+            to write all the columns
+            drop (bool, optional): let a rewrite of all the columns drop the
+            stored columns that are not in the df (ie.: a partial load).
+            Default is False to refuse the rewrite
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): column names written
+        """
+        try:
+            os.makedirs(path, exist_ok=True)
+            manifest = self.manifest(path)
+            old = dict(manifest["files"])
+
+            # rows changed, the stored columns no longer fit the df
+            if manifest["rows"] != len(data_frame.index):
+                columns = None
+
+            # columns missing in the store are always written
+            ans = list(data_frame.columns)
+            if columns is not None:
+                ans = [col for col in data_frame.columns
+                       if col in columns or col not in manifest["files"]]
+            else:
+                # a partial df would lose the stored columns it lacks
+                lost = [col for col in manifest["columns"]
+                        if col not in data_frame.columns]
+                if len(lost) > 0 and not drop:
+                    raise ValueError("Frames: saving all the columns would "
+                                     "drop the stored columns " + str(lost) +
+                                     ", load them before saving")
+                manifest["columns"] = list()
+                manifest["files"] = dict()
+
+            for col in ans:
+                manifest["files"][col] = self.write(path, data_frame[col])
+                if col not in manifest["columns"]:
+                    manifest["columns"].append(col)
+
+            manifest["rows"] = len(data_frame.index)
+            self.commit(path, manifest)
+
+            # old column files no longer in the manifest
+            kept = [entry["file"] for entry in manifest["files"].values()]
+            for entry in old.values():
+                fp = os.path.join(path, entry["file"])
+                if entry["file"] in kept:
+                    continue
+                if os.path.exists(fp):
+                    os.remove(fp)
+
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: save")
+
+    def write(self, path, column):
+        """
+        Write a column in a new compressed file of the stored frame
+
+        Args:
+            path (str): local dirpath of the stored frame
+            column (Series): pandas column to write
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dict): file name and compression of the column
+        """
+        try:
+            # a new name per write keeps the old file until the manifest
+            # points to the new one
+            fn = uuid.uuid4().hex + "." + self.fmt
+            fp = os.path.join(path, fn)
+            cdf = column.to_frame(name=column.name).reset_index(drop=True)
+
+            if self.fmt == "parquet":
+                cdf.to_parquet(fp, compression=self.compression, index=False)
+            elif self.fmt == "feather":
+                cdf.to_feather(fp, compression=self.compression)
+            else:
+                cdf.to_pickle(fp, compression=self.compression)
+
+            ans = {"file": fn, "compression": self.compression}
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: write")
+
+    def read(self, path, entry):
+        """
+        Read a column file of the stored frame, the format comes from the
+        file extension
+
+        Args:
+            path (str): local dirpath of the stored frame
+            entry (dict): file name and compression of the column, see
+            write()
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (Series): pandas column
+        """
+        try:
+            fp = os.path.join(path, entry["file"])
+            fmt = os.path.splitext(entry["file"])[1].lstrip(".")
+
+            if fmt == "parquet":
+                cdf = pd.read_parquet(fp)
+            elif fmt == "feather":
+                cdf = pd.read_feather(fp)
+            else:
+                cdf = pd.read_pickle(fp, compression=entry["compression"])
+
+            ans = cdf[cdf.columns[0]]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: read")
+
+    def load(self, path, columns=None):
+        """
+        Load the columns of a stored frame into a dataframe
+
+        Args:
+            path (str): local dirpath of the stored frame
+            columns (list, optional): column names to read. Default is None
+            to read all the columns
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (data_frame): pandas df with the stored columns
+        """
+        try:
+            manifest = self.manifest(path)
+            cols = manifest["columns"]
+            if columns is not None:
+                cols = [col for col in cols if col in columns]
+
+            data = dict()
+            for col in cols:
+                data[col] = self.read(path, manifest["files"][col])
+
+            ans = pd.DataFrame(data, columns=cols)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Frames: load")
@@ -0,0 +1,236 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import json
+import time
+import threading
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# status of a finished task
+DONE = "done"
+# status of a task that raised an error
+FAILED = "failed"
+
+
+class Journal():
+    """
+    this module keeps a persistent journal of the scrapping tasks of every
+    letter (route) and field (ie.: metadata, notes, images), each task is
+    appended to a JSON lines file with its status, time and error so a new
+    run only repeats the missing or failed tasks
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    path = str()
+    tasks = None
+    lock = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Journal()
+
+        Args:
+            path (str, optional): local filepath of the journal file, without
+            it the journal is only kept in memory. Default is empty
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.path = str()
+            self.tasks = dict()
+            self.lock = threading.Lock()
+
+            # local filepath of the journal
+            if len(args) > 0:
+                self.path = args[0]
+
+            self.load()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: __init__")
+
+    def load(self):
+        """
+        Load the tasks of the previous runs, the last entry of a route and
+        field is its current status
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as file:
+                    for line in file:
+                        # a half written entry is ignored
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        route = entry.pop("route")
+                        field = entry.pop("field")
+                        self.tasks.setdefault(route, dict())[field] = entry
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: load")
+
+    def mark(self, route, field, error=None, empty=False):
+        """
+        Record the result of the task of a route and field
+
+        Args:
+            route (str): letter ID
+            field (str): scrapped field, ie.: metadata, original, images
+            error (Exception, optional): error raised by the task, None if
+            the task is done. Default is None
+            empty (bool, optional): True if the task is done but the scrapped
+            value is empty, ie.: a letter without notes. Default is False
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            entry = {
+                "status": DONE if error is None else FAILED,
+                "time": time.time(),
+                "error": None if error is None else repr(error),
+                "empty": bool(empty) and error is None,
+            }
+
+            with self.lock:
+                self.tasks.setdefault(route, dict())[field] = entry
+
+                if self.path:
+                    line = dict(route=route, field=field, **entry)
+                    with open(self.path, "a", encoding="utf-8") as file:
+                        file.write(json.dumps(line) + "\n")
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: mark")
+
+    def status(self, route, field):
+        """
+        Get the last recorded status of the task of a route and field
+
+        Args:
+            route (str): letter ID
+            field (str): scrapped field, ie.: metadata, original, images
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (str): done, failed or None if it never ran
+        """
+        try:
+            ans = self.tasks.get(route, dict()).get(field, dict()).get("status")
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: status")
+
+    def done(self, route, *fields):
+        """
+        Check if the tasks of a route are finished for all the given fields
+
+        Args:
+            route (str): letter ID
+            fields (str): scrapped fields, ie.: metadata, original, images
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if all the tasks are done
+        """
+        try:
+            ans = all(self.status(route, field) == DONE for field in fields)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: done")
+
+    def empty(self, route, *fields):
+        """
+        Check if the tasks of a route are done with empty scrapped values for
+        all the given fields
+
+        Args:
+            route (str): letter ID
+            fields (str): scrapped fields, ie.: metadata, original, images
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if all the tasks are done and empty
+        """
+        try:
+            tasks = self.tasks.get(route, dict())
+            ans = self.done(route, *fields) and all(
+                tasks[field].get("empty", False) for field in fields)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: empty")
+
+    def failed(self, field):
+        """
+        List the routes whose task for a field failed in the last attempt
+
+        Args:
+            field (str): scrapped field, ie.: metadata, original, images
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (list): letter IDs with a failed task
+        """
+        try:
+            ans = [route for route in self.tasks
+                   if self.status(route, field) == FAILED]
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Journal: failed")
@@ -0,0 +1,209 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Third party imports
+# =========================================
+import pandas as pd
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# number of rows kept in the column buffers before building a chunk
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Rows():
+    """
+    this module accumulates records (ie.: letters) in pre-sized column
+    buffers, the buffers become a dataframe chunk when they are full and all
+    the chunks are joined in a single dataframe only when it is needed
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    columns = list()
+    chunk_size = DEFAULT_CHUNK_SIZE
+    buffers = None
+    count = 0
+    chunks = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Rows()
+
+        Args:
+            columns (list, optional): column names of the records, new keys
+            found in the records are added as new columns. Default is empty
+            chunk_size (int, optional): rows in a chunk. Default is 1000
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.columns = list()
+            self.chunk_size = kwargs.get("chunk_size", DEFAULT_CHUNK_SIZE)
+
+            # column names of the records
+            if len(args) > 0:
+                self.columns = list(args[0])
+
+            self.chunks = list()
+            self.reset()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Rows: __init__")
+
+    def reset(self):
+        """
+        Empty the column buffers, one list of chunk_size for each column
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.buffers = dict()
+            for col in self.columns:
+                self.buffers[col] = [None] * self.chunk_size
+            self.count = 0
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Rows: reset")
+
+    def add(self, record):
+        """
+        Add a record in the column buffers, missing columns are None
+
+        Args:
+            record (dict): column name and value of the record
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            for col, value in record.items():
+                if col not in self.buffers:
+                    self.columns.append(col)
+                    self.buffers[col] = [None] * self.chunk_size
+                self.buffers[col][self.count] = value
+
+            self.count += 1
+            if self.count == self.chunk_size:
+                self.chunk()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Rows: add")
+
+    def chunk(self):
+        """
+        Build a dataframe chunk with the filled rows of the buffers and
+        empty them
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if self.count > 0:
+                data = dict()
+                for col in self.columns:
+                    data[col] = self.buffers[col][:self.count]
+                self.chunks.append(pd.DataFrame(data, columns=self.columns))
+            self.reset()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Rows: chunk")
+
+    def pending(self):
+        """
+        Count the records added and not yet joined into a dataframe
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (int): number of pending records
+        """
+        try:
+            ans = self.count
+            for chunk in self.chunks:
+                ans += len(chunk)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Rows: pending")
+
+    def build(self, data_frame=None):
+        """
+        Join all the pending records into a single dataframe, at the end of
+        an existing one if given, and empty the accumulator
+
+        Args:
+            data_frame (dataframe, optional): dataframe to extend. Default is
+            None
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (dataframe): dataframe with all the records
+        """
+        try:
+            self.chunk()
+            frames = list(self.chunks)
+            self.chunks = list()
+
+            # an empty dataframe only gives its columns
+            columns = list()
+            if data_frame is not None:
+                if len(frames) == 0:
+                    return data_frame
+                columns = list(data_frame.columns)
+                if len(data_frame) > 0:
+                    frames.insert(0, data_frame)
+
+            if len(frames) == 0:
+                ans = pd.DataFrame(columns=self.columns)
+            elif len(frames) == 1:
+                ans = frames[0]
+            else:
+                ans = pd.concat(frames, ignore_index=True)
+
+            # existing columns first, then the new ones
+            columns += [col for col in ans.columns if col not in columns]
+            ans = ans.reindex(columns=columns)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Rows: build")
@@ -0,0 +1,273 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# =========================================
+# Standard library imports
+# =========================================
+import os
+import csv
+import json
+
+# =========================================
+# Local application imports
+# =========================================
+import Conf
+from Lib.Utils import Err
+assert Conf
+assert Err
+
+# =========================================
+# Global variables
+# =========================================
+# number of records written to the CSV file at once
+DEFAULT_BATCH_SIZE = 10
+# sufix of the resume marker file next to the CSV file
+DEFAULT_MARKER_SUFIX = ".done"
+
+
+class Writer():
+    """
+    this module appends records (ie.: letters) to a CSV file as soon as they
+    are scraped, every written batch is checkpointed in a resume marker file
+    with the IDs of the records and the CSV size, so a restarted run skips
+    the records already written and drops any half written row
+    """
+
+    # =========================================
+    # class variables
+    # =========================================
+    path = str()
+    marker = str()
+    columns = list()
+    key = str()
+    batch_size = DEFAULT_BATCH_SIZE
+    batch = None
+    done = None
+    offset = 0
+
+    def __init__(self, *args, **kwargs):
+        """
+        class creator for Writer()
+
+        Args:
+            path (str): local filepath of the CSV file
+            columns (list): column names of the CSV file
+            key (str, optional): column with the ID of the records.
+            Default is ID
+            batch_size (int, optional): records written at once. Default is 10
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            # default object attributes
+            self.path = str()
+            self.columns = list()
+            self.key = kwargs.get("key", "ID")
+            self.batch_size = kwargs.get("batch_size", DEFAULT_BATCH_SIZE)
+            self.batch = list()
+            self.done = set()
+            self.offset = 0
+
+            # local filepath and columns of the CSV file
+            if len(args) > 0:
+                self.path = args[0]
+            if len(args) > 1:
+                self.columns = list(args[1])
+
+            self.marker = self.path + DEFAULT_MARKER_SUFIX
+            self.resume()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: __init__")
+
+    def resume(self):
+        """
+        Load the resume marker of a previous run, the CSV file is truncated
+        to the last checkpoint and a new file starts with the header
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (set): IDs of the records already in the CSV file
+        """
+        try:
+            if os.path.exists(self.marker) and os.path.exists(self.path):
+                with open(self.marker, "r", encoding="utf-8") as file:
+                    for line in file:
+                        # a half written checkpoint is ignored
+                        try:
+                            check = json.loads(line)
+                        except ValueError:
+                            break
+                        self.done.update(check.get("ids"))
+                        self.offset = check.get("offset")
+
+                # dropping the rows written after the last checkpoint
+                with open(self.path, "r+b") as file:
+                    file.truncate(self.offset)
+
+            else:
+                with open(self.path, "w", encoding="utf-8", newline="") as file:
+                    writer = self.writer(file)
+                    writer.writeheader()
+                    file.flush()
+                    self.offset = os.fstat(file.fileno()).st_size
+
+                with open(self.marker, "w", encoding="utf-8") as file:
+                    self.checkpoint(file, list())
+
+            ans = self.done
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: resume")
+
+    def writer(self, file):
+        """
+        Create the CSV writer with the same quoting of Gallery.save_gallery()
+
+        Args:
+            file (file-object): opened CSV file
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (csv.DictWriter): writer of the records
+        """
+        try:
+            ans = csv.DictWriter(file,
+                                 fieldnames=self.columns,
+                                 restval="",
+                                 extrasaction="ignore",
+                                 delimiter=",",
+                                 quoting=csv.QUOTE_ALL)
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: writer")
+
+    def checkpoint(self, file, ids):
+        """
+        Append a checkpoint to the resume marker and sync it to disk
+
+        Args:
+            file (file-object): opened resume marker file
+            ids (list): IDs of the records written since the last checkpoint
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            check = {"ids": ids, "offset": self.offset}
+            file.write(json.dumps(check) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: checkpoint")
+
+    def written(self, route):
+        """
+        Check if a record was already written in this run or a previous one
+
+        Args:
+            route (str): ID of the record
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+
+        Returns:
+            ans (bool): True if the record is in the CSV file
+        """
+        try:
+            ans = route in self.done
+            return ans
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: written")
+
+    def write(self, record):
+        """
+        Add a record to the current batch, the batch is written when full
+
+        Args:
+            record (dict): column name and value of the record
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.batch.append(record)
+            if len(self.batch) >= self.batch_size:
+                self.flush()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: write")
+
+    def flush(self):
+        """
+        Append the current batch to the CSV file and checkpoint it
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            if len(self.batch) > 0:
+                ids = [str(record.get(self.key)) for record in self.batch]
+
+                with open(self.path, "a", encoding="utf-8", newline="") as file:
+                    writer = self.writer(file)
+                    writer.writerows(self.batch)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    self.offset = os.fstat(file.fileno()).st_size
+
+                # the marker is written after the rows are on disk
+                with open(self.marker, "a", encoding="utf-8") as file:
+                    self.checkpoint(file, ids)
+
+                self.done.update(ids)
+                self.batch = list()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: flush")
+
+    def close(self):
+        """
+        Write the last batch of records
+
+        Raises:
+            exp: raise a generic exception if something goes wrong
+        """
+        try:
+            self.flush()
+
+        # exception handling
+        except Exception as exp:
+            Err.reraise(exp, "Writer: close")
@@ -0,0 +1,159 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+import random
+import re
+import unicodedata
+import pandas as pd
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Recovery.Cleaner import Topic as Topic
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the text cleaning of the class Topic, the compiled
+rules must give the same answer of the original chain of re.sub() calls
+"""
+
+
+def legacy_clrtext(text):
+    """
+    original implementation of Gallery.clrtext() used as reference
+    """
+    ans = str(text)
+    ans = ans.strip()
+    ans = unicodedata.normalize('NFD', ans)
+    ans = ans.encode('ascii', 'ignore')
+    ans = ans.decode("utf-8")
+    ans = str(ans)
+    ans = re.sub(r" \s+", " ", ans)
+    ans = re.sub(r"\n", ". ", ans)
+    ans = re.sub(r"\r", ". ", ans)
+    ans = re.sub(r"'", "", ans)
+    ans = re.sub(r"’", "", ans)
+    ans = re.sub(r"None{1,3}", " ", ans)
+    ans = re.sub(r";", "", ans)
+    ans = re.sub(r",", "", ans)
+    ans = str(ans)
+    ans = re.sub(r" \s+", " ", ans)
+    return ans
+
+
+@pytest.fixture
+def texts():
+    """
+    samples->list: fixture texts with the characters touched by the rules
+    """
+    pytest.samples = [
+        "",
+        None,
+        "  Mon cher Théo,\n\nje t’écris ; vite  ",
+        "a \n b\r\nc",
+        "No'ne Noneee No,ne None;",
+        "x ;\t, y , \n\x0b z",
+        "Ça   va ? Ærø — “quoted” 'single'",
+        12.5,
+    ]
+
+    # random texts built from the special characters
+    rnd = random.Random(42)
+    alphabet = [" ", "\n", "\r", "\t", "'", "’", ";", ",", "N", "o", "n",
+                "e", "None", "é", "a", ".", "\x0b", " ", "Œ"]
+    for i in range(500):
+        size = rnd.randint(0, 30)
+        pytest.samples.append("".join(rnd.choice(alphabet)
+                                      for j in range(size)))
+
+
+def test_clrtext(texts):
+    """
+    test the compiled clrtext() against the original implementation.
+
+    Args:
+        texts: fixture texts to clean
+    """
+    topic = Topic()
+    for text in pytest.samples:
+        assert topic.clrtext(text) == legacy_clrtext(text)
+
+
+def test_clrtexts(texts):
+    """
+    test the batch clrtexts() with lists and pandas Series.
+
+    Args:
+        texts: fixture texts to clean
+    """
+    topic = Topic()
+    expected = [legacy_clrtext(text) for text in pytest.samples]
+
+    # list in, list out
+    assert topic.clrtexts(pytest.samples) == expected
+
+    # Series in, Series out with the same index and name
+    series = pd.Series(pytest.samples, name="NOTES",
+                       index=range(10, 10 + len(pytest.samples)))
+    ans = topic.clrtexts(series)
+    assert isinstance(ans, pd.Series)
+    assert ans.name == "NOTES"
+    assert list(ans.index) == list(series.index)
+    assert list(ans) == expected
+
+
+def test_clrcolumn(texts):
+    """
+    test the vectorized clrcolumn() with lists, pandas Series and texts
+    with the column separator.
+
+    Args:
+        texts: fixture texts to clean
+    """
+    topic = Topic()
+    expected = [legacy_clrtext(text) for text in pytest.samples]
+
+    # list in, list out
+    assert topic.clrcolumn(pytest.samples) == expected
+    assert topic.clrcolumn([]) == []
+
+    # Series in, Series out with the same index and name
+    series = pd.Series(pytest.samples, name="NOTES",
+                       index=range(10, 10 + len(pytest.samples)))
+    ans = topic.clrcolumn(series)
+    assert isinstance(ans, pd.Series)
+    assert ans.name == "NOTES"
+    assert list(ans.index) == list(series.index)
+    assert list(ans) == expected
+
+    # a text with the separator still gives one clean text
+    samples = ["a\x00b ; c", " Théo "]
+    expected = [legacy_clrtext(text) for text in samples]
+    assert topic.clrcolumn(samples) == expected
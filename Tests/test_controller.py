@@ -0,0 +1,96 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+import os
+import sys
+import numpy as np
+
+# the App modules import their own Conf with the config loaders, the Lib
+# modules imported before work with any of them
+app_path = os.path.join(os.path.dirname(__file__), "..", "App")
+sys.path.insert(0, os.path.abspath(app_path))
+if not hasattr(sys.modules.get("Conf"), "configGlobal"):
+    sys.modules.pop("Conf", None)
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Controller import Controller as Controller
+from Lib.Utils.Journal import Journal as Journal
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the resume of the scrapping tasks of the class
+Controller, pending() lists the letters to scrap again
+"""
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """
+    journal->str: fixture filepath of the journal of a previous run
+    """
+    pytest.journal = str(tmp_path / "journal.jsonl")
+
+
+def test_crash(journal):
+    """
+    test a letter done in the journal of a run that crashed before saving
+    the dataframe, its reloaded values are empty and it is scrapped again.
+
+    Args:
+        journal: fixture journal
+    """
+    Journal(pytest.journal).mark("001", "metadata")
+    ctrl = Controller(journal=Journal(pytest.journal))
+    data = {"TITLE": [""], "AUTHOR": [np.nan]}
+    assert ctrl.pending(["001"], ["metadata"], data) == [0]
+
+
+def test_pending(journal):
+    """
+    test the done letters with values or recorded as empty are skipped,
+    the failed letters and the new letters without values are pending.
+
+    Args:
+        journal: fixture journal
+    """
+    ctrl = Controller(journal=Journal(pytest.journal))
+    ctrl.journal.mark("001", "notes")
+    ctrl.journal.mark("002", "notes", empty=True)
+    ctrl.journal.mark("003", "notes", ValueError("404"))
+
+    routes = ["001", "002", "003", "004", "005"]
+    data = {"NOTES": ["a note", None, "old note", "", "other note"]}
+    assert ctrl.pending(routes, ["notes"], data) == [2, 3]
+
+    # the empty flag survives a new run
+    ctrl = Controller(journal=Journal(pytest.journal))
+    assert ctrl.pending(routes, ["notes"], data) == [2, 3]
@@ -0,0 +1,161 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+import pandas as pd
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Utils.Database import Database as Database
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the SQLite store of the letters class Database, all of
+them run over an in-memory database
+"""
+
+COLUMNS = ["ID", "TITLE", "AUTHOR", "ADDRESSEE", "DATE", "NOTES",
+           "ARTWORKSTITLE", "ARTWORKSF", "ARTWORKSJH", "ARTWORKSLINK",
+           "ARTWORKSID", "URL"]
+
+
+@pytest.fixture
+def database():
+    """
+    database->Database: fixture in-memory database with two letters
+    """
+    pytest.database = Database(":memory:", columns=COLUMNS)
+    pytest.database.upsert([
+        {"ID": "let001", "URL": "u1", "AUTHOR": "Vincent"},
+        {"ID": "let002", "URL": "u2", "AUTHOR": "Theo"},
+    ])
+    yield pytest.database
+    pytest.database.close()
+
+
+@pytest.mark.parametrize("artworks", [
+    # scrapped lists, option 9
+    {"ARTWORKSF": ["F 422", "F 12"], "ARTWORKSJH": ["JH 1234", "JH 5"],
+     "ARTWORKSID": ["a1", "a2"]},
+    # stringified lists, a loaded CSV
+    {"ARTWORKSF": "['F 422', 'F 12']", "ARTWORKSJH": "['JH 1234', 'JH 5']",
+     "ARTWORKSID": "['a1', 'a2']"},
+    # joined texts
+    {"ARTWORKSF": "F 422, F 12", "ARTWORKSJH": "JH 1234, JH 5",
+     "ARTWORKSID": "a1, a2"},
+])
+def test_artworks(database, artworks):
+    """
+    test upsert() and find() of the artworks catalog numbers with the
+    formats of the artworks columns.
+
+    Args:
+        database: fixture database
+        artworks: artworks columns of a letter
+    """
+    record = dict(ID="let001", **artworks)
+    assert database.upsert([record]) == 1
+
+    assert database.find("ARTWORKSF", "F 422") == ["let001"]
+    assert database.find("ARTWORKSJH", "JH 5") == ["let001"]
+    assert database.find("ARTWORKSF", "['F 422'") == []
+
+    letter = database.get("let001")
+    assert letter["ARTWORKSF"] == "F 422, F 12"
+    assert letter["ARTWORKSID"] == "a1, a2"
+    assert letter["ARTWORKSTITLE"] == ""
+
+
+def test_upsert(database):
+    """
+    test the partial updates, the letters order and the replace of the
+    artworks.
+
+    Args:
+        database: fixture database
+    """
+    # only the given columns change
+    database.upsert([{"ID": "let002", "NOTES": "note"}])
+    letter = database.get("let002")
+    assert letter["AUTHOR"] == "Theo"
+    assert letter["NOTES"] == "note"
+    assert letter["URL"] == "u2"
+    assert database.get("let003") is None
+
+    # empty values are NULL
+    database.upsert([{"ID": "let003", "NOTES": float("nan")}])
+    assert database.get("let003")["NOTES"] is None
+    assert list(database.column("ID", size=2)) == ["let001", "let002",
+                                                   "let003"]
+    assert database.find("AUTHOR", "Vincent") == ["let001"]
+
+    # the artworks of a letter are replaced
+    database.upsert([{"ID": "let001", "ARTWORKSID": ["a1", "a2"]}])
+    database.upsert([{"ID": "let001", "ARTWORKSID": ["a3"]}])
+    assert database.get("let001")["ARTWORKSID"] == "a3"
+    database.upsert([{"ID": "let001", "ARTWORKSID": []}])
+    assert database.get("let001")["ARTWORKSID"] == ""
+
+    # deleting a letter drops its artworks
+    database.upsert([{"ID": "let002", "ARTWORKSF": ["F 1"]}])
+    assert database.delete(["let002"]) == 1
+    assert database.count() == 2
+    assert database.find("ARTWORKSF", "F 1") == []
+
+
+def test_frame(database):
+    """
+    test the dataframe round trip with from_frame() and to_frame().
+
+    Args:
+        database: fixture database
+    """
+    df = pd.DataFrame({
+        "ID": ["let001", "let004"],
+        "TITLE": ["one", "four"],
+        "ARTWORKSF": ["['F 7']", ""],
+        "ARTWORKSID": ["['a7']", ""],
+        "EXTRA": ["ignored", "ignored"],
+    })
+    assert database.from_frame(df) == 2
+    assert database.count() == 3
+
+    ans = database.to_frame()
+    assert list(ans.columns) == COLUMNS
+    assert list(ans["ID"]) == ["let001", "let002", "let004"]
+    assert list(ans["TITLE"].fillna("")) == ["one", "", "four"]
+    assert list(ans["AUTHOR"].fillna("")) == ["Vincent", "Theo", ""]
+    assert list(ans["ARTWORKSF"]) == ["F 7", "", ""]
+
+    # only the given columns
+    df["TITLE"] = ["uno", "cuatro"]
+    database.from_frame(df, columns=["TITLE"])
+    assert database.get("let004")["TITLE"] == "cuatro"
+    assert database.get("let001")["ARTWORKSF"] == "F 7"
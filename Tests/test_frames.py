@@ -0,0 +1,123 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+import os
+import pandas as pd
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Utils.Frames import Frames as Frames
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the binary columnar store of the gallery, the class
+Frames, with the compressed pickle files that need no extra library
+"""
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """
+    stored->str: fixture columnar store with a small gallery
+    """
+    pytest.path = str(tmp_path / "gallery")
+    pytest.gallery = pd.DataFrame({
+        "ID": ["let001", "let002", "let003"],
+        "TITLE": ["one", "two", "three"],
+        "NOTES": ["multi\nline", None, "long " * 100],
+    })
+    pytest.frames = Frames("pickle")
+    pytest.frames.save(pytest.path, pytest.gallery)
+
+
+def test_incremental(stored):
+    """
+    test the save of only some columns, the other stored columns keep
+    their files and new columns are appended.
+
+    Args:
+        stored: fixture columnar store
+    """
+    frames = pytest.frames
+    before = frames.manifest(pytest.path)["files"]
+
+    df = pytest.gallery.copy()
+    df["TITLE"] = ["uno", "dos", "tres"]
+    df["URL"] = ["u1", "u2", "u3"]
+    assert frames.save(pytest.path, df, ["TITLE"]) == ["TITLE", "URL"]
+
+    after = frames.manifest(pytest.path)["files"]
+    assert after["ID"] == before["ID"]
+    assert after["NOTES"] == before["NOTES"]
+    assert after["TITLE"] != before["TITLE"]
+    assert not os.path.exists(os.path.join(pytest.path,
+                                           before["TITLE"]["file"]))
+
+    ans = frames.load(pytest.path)
+    pd.testing.assert_frame_equal(ans, df, check_dtype=False)
+    ans = frames.load(pytest.path, ["NOTES", "ID"])
+    assert list(ans.columns) == ["ID", "NOTES"]
+
+
+def test_partial(stored):
+    """
+    test that a partial load with new rows can not drop the stored
+    columns it lacks.
+
+    Args:
+        stored: fixture columnar store
+    """
+    frames = pytest.frames
+    df = frames.load(pytest.path, ["ID", "TITLE"])
+    df = pd.concat([df, pd.DataFrame({"ID": ["let004"], "TITLE": ["four"]})],
+                   ignore_index=True)
+
+    with pytest.raises(Exception):
+        frames.save(pytest.path, df, ["ID", "TITLE"])
+    with pytest.raises(Exception):
+        frames.save(pytest.path, df)
+
+    # the store is untouched
+    ans = frames.load(pytest.path)
+    pd.testing.assert_frame_equal(ans, pytest.gallery, check_dtype=False)
+
+    # the same rows only rewrite the given columns
+    df = frames.load(pytest.path, ["ID", "TITLE"])
+    df["TITLE"] = ["a", "b", "c"]
+    frames.save(pytest.path, df, ["TITLE"])
+    ans = frames.load(pytest.path)
+    assert list(ans["TITLE"]) == ["a", "b", "c"]
+    assert list(ans["NOTES"].fillna("")) == ["multi\nline", "",
+                                             "long " * 100]
+
+    # an explicit drop rewrites the store with the partial df
+    frames.save(pytest.path, df, drop=True)
+    assert list(frames.load(pytest.path).columns) == ["ID", "TITLE"]
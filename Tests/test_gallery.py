@@ -0,0 +1,106 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# the App modules import their own Conf with the config loaders, the Lib
+# modules imported before work with any of them
+app_path = os.path.join(os.path.dirname(__file__), "..", "App")
+sys.path.insert(0, os.path.abspath(app_path))
+if not hasattr(sys.modules.get("Conf"), "configGlobal"):
+    sys.modules.pop("Conf", None)
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from App.Model import Gallery as Gallery
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the column access of the class Gallery, getdata()
+must not copy the text columns
+"""
+
+
+@pytest.fixture
+def gallery():
+    """
+    gallery->Gallery: fixture gallery with object, string and int columns
+    """
+    pytest.gallery = Gallery()
+    pytest.gallery.data_frame = pd.DataFrame({
+        "ID": pd.Series(["let001", "let002", None], dtype="str"),
+        "NOTES": pd.Series(["long " * 100, None, "x"], dtype=object),
+        "COUNT": [1, 2, 3],
+    })
+
+
+@pytest.mark.parametrize("column", ["ID", "NOTES"])
+def test_view(gallery, column):
+    """
+    test that getdata() shares the memory of the object and python string
+    columns and can not change them.
+
+    Args:
+        gallery: fixture gallery
+        column: column name
+    """
+    gm = pytest.gallery
+    data = gm.data_frame[column]
+    ans = gm.getdata(column)
+
+    if getattr(data.dtype, "storage", "python") == "python":
+        assert np.shares_memory(ans, data.to_numpy())
+    assert not ans.flags.writeable
+    with pytest.raises(ValueError):
+        ans[0] = "changed"
+    assert data[0] != "changed"
+    assert list(ans) == data.tolist()
+
+
+def test_copy(gallery):
+    """
+    test the mutable copies and the python values of the other columns.
+
+    Args:
+        gallery: fixture gallery
+    """
+    gm = pytest.gallery
+    ans = gm.getdata("NOTES", mutable=True)
+    assert isinstance(ans, list)
+    ans[0] = "changed"
+    assert gm.data_frame["NOTES"][0] == "long " * 100
+
+    ans = gm.getdata("COUNT")
+    assert [type(value) for value in ans] == [int, int, int]
+    assert not ans.flags.writeable
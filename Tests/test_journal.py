@@ -0,0 +1,99 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Utils.Journal import Journal as Journal
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the resumable journal of the scrapping tasks, the
+class Journal
+"""
+
+
+def test_mark(tmp_path):
+    """
+    test mark(), done() and failed(), the last entry of a task is its
+    status and a new journal over the same file loads it.
+
+    Args:
+        tmp_path: pytest temporary dirpath
+    """
+    path = str(tmp_path / "journal.jsonl")
+    journal = Journal(path)
+    assert journal.status("let001", "notes") is None
+
+    journal.mark("let001", "metadata")
+    journal.mark("let001", "notes", ValueError("404"))
+    journal.mark("let002", "notes", ValueError("404"))
+    journal.mark("let002", "notes")
+
+    assert journal.done("let001", "metadata")
+    assert not journal.done("let001", "metadata", "notes")
+    assert journal.done("let002", "notes")
+    assert journal.failed("notes") == ["let001"]
+
+    # a half written entry of a crashed run is ignored
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"route": "let003", "fie')
+
+    ans = Journal(path)
+    assert ans.tasks == journal.tasks
+    assert ans.failed("notes") == ["let001"]
+    assert ans.status("let003", "notes") is None
+    assert "ValueError" in ans.tasks["let001"]["notes"]["error"]
+
+
+def test_memory():
+    """
+    test a journal without file, the tasks are only kept in memory.
+    """
+    journal = Journal()
+    journal.mark("let001", "images")
+    assert journal.done("let001", "images")
+    assert journal.failed("images") == []
+
+
+def test_empty():
+    """
+    test empty(), a task is empty only if it is done with an empty value.
+    """
+    journal = Journal()
+    journal.mark("let001", "notes", empty=True)
+    journal.mark("let002", "notes")
+    journal.mark("let003", "notes", ValueError("404"), empty=True)
+
+    assert journal.empty("let001", "notes")
+    assert not journal.empty("let002", "notes")
+    assert not journal.empty("let003", "notes")
+    assert not journal.empty("let004", "notes")
@@ -0,0 +1,107 @@
+"""
+* Copyright 2020, Maestria de Humanidades Digitales,
+* Universidad de Los Andes
+*
+* Developed for the Msc graduation project in Digital Humanities
+*
+* This program is free software: you can redistribute it and/or modify
+* it under the terms of the GNU General Public License as published by
+* the Free Software Foundation, either version 3 of the License, or
+* (at your option) any later version.
+*
+* This program is distributed in the hope that it will be useful,
+* but WITHOUT ANY WARRANTY; without even the implied warranty of
+* MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+* GNU General Public License for more details.
+*
+* You should have received a copy of the GNU General Public License
+* along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ___________________________________________
+# importing test framework and necesarry libraries
+# ___________________________________________
+import config
+import pytest
+import os
+import pandas as pd
+
+# ___________________________________________
+# importing costume scrapping module
+# ___________________________________________
+from Lib.Utils.Writer import Writer as Writer
+
+# ___________________________________________
+# asserting imports in the module
+# ___________________________________________
+assert pytest
+assert config
+
+"""
+these are tests for the crash recovery of the class Writer, a new writer
+over the same CSV file must resume from the last checkpoint
+"""
+
+COLUMNS = ["ID", "TITLE", "NOTES"]
+
+
+@pytest.fixture
+def written(tmp_path):
+    """
+    written->str: fixture CSV file with two checkpointed batches of two
+    letters
+    """
+    pytest.path = str(tmp_path / "letters.csv")
+    writer = Writer(pytest.path, COLUMNS, batch_size=2)
+    for i in range(4):
+        writer.write({"ID": "let%03d" % i, "TITLE": "title %d" % i,
+                      "NOTES": "multi\nline, \"quoted\""})
+    writer.close()
+    pytest.offset = os.path.getsize(pytest.path)
+
+
+def test_resume(written):
+    """
+    test resume() after a torn write, the rows and the checkpoint written
+    after the last complete checkpoint are dropped.
+
+    Args:
+        written: fixture CSV file
+    """
+    # a half written row and a half written checkpoint
+    with open(pytest.path, "a", encoding="utf-8") as file:
+        file.write('"let004","title 4","cut')
+    with open(pytest.path + ".done", "a", encoding="utf-8") as file:
+        file.write('{"ids": ["let004"], "off')
+
+    writer = Writer(pytest.path, COLUMNS, batch_size=2)
+    assert os.path.getsize(pytest.path) == pytest.offset
+    assert writer.offset == pytest.offset
+    assert writer.resume() == {"let000", "let001", "let002", "let003"}
+    assert writer.written("let003")
+    assert not writer.written("let004")
+
+    # the resumed file keeps appending complete rows
+    writer.write({"ID": "let004", "TITLE": "title 4"})
+    writer.close()
+    ans = pd.read_csv(pytest.path)
+    assert list(ans["ID"]) == ["let%03d" % i for i in range(5)]
+    assert ans["NOTES"][0] == "multi\nline, \"quoted\""
+
+
+def test_unflushed(written):
+    """
+    test that the records of a batch that was never flushed are not
+    written.
+
+    Args:
+        written: fixture CSV file
+    """
+    writer = Writer(pytest.path, COLUMNS, batch_size=2)
+    writer.write({"ID": "let004"})
+
+    # a crash before close(), the batch is lost and scraped again
+    ans = Writer(pytest.path, COLUMNS, batch_size=2)
+    assert not ans.written("let004")
+    assert os.path.getsize(pytest.path) == pytest.offset
+    assert len(ans.done) == 4